@@ -1,40 +1,87 @@
+import heapq
+from array import array
+
+INSERTION_SORT_MAX_SIZE = 32
+NEARLY_SORTED_MAX_DESCENTS = 4
+NIL = -1
+# Мітки порядку вузлів IndexedLinkedList: початкова розрядність універсуму
+# та поріг щільності T (1 < T < 2) для локального перерозподілу міток
+LABEL_BITS = 62
+LABEL_DENSITY = 1.4
+
+
 class Node:
+  __slots__ = ("data", "next")
+
   def __init__(self, data=None):
     self.data = data
     self.next = None
 
 
 class LinkedList:
+  node_class = Node
+
   def __init__(self):
     self.head = None
+    self.tail = None
+    self.size = 0
+
+  # Побудова списку з будь-якої послідовності за O(n)
+  @classmethod
+  def from_iterable(cls, iterable):
+    linked_list = cls()
+    linked_list.extend(iterable)
+    return linked_list
+
+  def __len__(self):
+    return self.size
+
+  def __iter__(self):
+    cur = self.head
+    while cur:
+      yield cur.data
+      cur = cur.next
 
   def insert_at_beginning(self, data):
-    new_node = Node(data)
+    new_node = self.node_class(data)
     new_node.next = self.head
     self.head = new_node
+    if self.tail is None:
+      self.tail = new_node
+    self.size += 1
 
+  # Вставка в кінець за O(1) завдяки вказівнику на хвіст
   def insert_at_end(self, data):
-    new_node = Node(data)
+    new_node = self.node_class(data)
     if self.head is None:
       self.head = new_node
     else:
-      cur = self.head
-      while cur.next:
-        cur = cur.next
-      cur.next = new_node
+      self.tail.next = new_node
+    self.tail = new_node
+    self.size += 1
+
+  def extend(self, iterable):
+    for data in iterable:
+      self.insert_at_end(data)
 
   def insert_after(self, prev_node: Node, data):
     if prev_node is None:
       print("Попереднього вузла не існує.")
       return
-    new_node = Node(data)
+    new_node = self.node_class(data)
     new_node.next = prev_node.next
     prev_node.next = new_node
+    if prev_node is self.tail:
+      self.tail = new_node
+    self.size += 1
 
   def delete_node(self, key: int):
     cur = self.head
     if cur and cur.data == key:
       self.head = cur.next
+      if self.head is None:
+        self.tail = None
+      self.size -= 1
       cur = None
       return
     prev = None
@@ -44,6 +91,9 @@ class LinkedList:
     if cur is None:
       return
     prev.next = cur.next
+    if cur is self.tail:
+      self.tail = prev
+    self.size -= 1
     cur = None
 
   def search_element(self, data: int) -> Node | None:
@@ -64,6 +114,7 @@ class LinkedList:
   def reverse(self):
     prev = None
     current = self.head
+    self.tail = current
 
     while current:
       next_node = current.next
@@ -73,60 +124,482 @@ class LinkedList:
     
     self.head = prev
 
-  # Новий метод: Сортування вставками
-  def insertion_sort(self):
+  # Автоматичний вибір алгоритму: вставки для малих або майже відсортованих
+  # списків, інакше - сортування злиттям за O(n log n)
+  def sort(self, key=None, reverse=False):
+    if self.size <= INSERTION_SORT_MAX_SIZE or self._is_nearly_sorted(key, reverse):
+      self.insertion_sort(key=key, reverse=reverse)
+    else:
+      self.merge_sort(key=key, reverse=reverse)
+
+  def _is_nearly_sorted(self, key, reverse):
+    descents = 0
+    current = self.head
+    while current and current.next:
+      if self._precedes(current.next.data, current.data, key, reverse):
+        descents += 1
+        if descents > NEARLY_SORTED_MAX_DESCENTS:
+          return False
+      current = current.next
+    return True
+
+  @staticmethod
+  def _precedes(a, b, key, reverse):
+    if key is not None:
+      a, b = key(a), key(b)
+    return b < a if reverse else a < b
+
+  # Новий метод: Сортування вставками (стабільне)
+  def insertion_sort(self, key=None, reverse=False):
     if not self.head or not self.head.next:
       return
     
-    sorted_head = None
-    current = self.head
+    sorted_head = self.head
+    sorted_tail = self.head
+    last_inserted = self.head
+    current = self.head.next
+    sorted_head.next = None
     
     while current:
       next_node = current.next
-      sorted_head = self._sorted_insert(sorted_head, current)
+      current.next = None
+      if not self._precedes(current.data, sorted_tail.data, key, reverse):
+        sorted_tail.next = current
+        sorted_tail = current
+      elif not self._precedes(current.data, last_inserted.data, key, reverse):
+        self._sorted_insert(last_inserted, current, key, reverse)
+      elif self._precedes(current.data, sorted_head.data, key, reverse):
+        current.next = sorted_head
+        sorted_head = current
+      else:
+        self._sorted_insert(sorted_head, current, key, reverse)
+      last_inserted = current
       current = next_node
     
     self.head = sorted_head
+    self.tail = sorted_tail
 
-  def _sorted_insert(self, sorted_head, new_node):
-    if not sorted_head or sorted_head.data >= new_node.data:
-      new_node.next = sorted_head
-      return new_node
-    
-    current = sorted_head
+  # Вставляє вузол після start, пропускаючи всі рівні йому елементи
+  def _sorted_insert(self, start, new_node, key, reverse):
+    current = start
     
-    while current.next and current.next.data < new_node.data:
+    while current.next and not self._precedes(new_node.data, current.next.data, key, reverse):
       current = current.next
     
     new_node.next = current.next
     current.next = new_node
+
+  # Новий метод: Ітеративне сортування злиттям знизу вгору.
+  # Перезв'язує наявні вузли без створення нових, стабільне
+  def merge_sort(self, key=None, reverse=False):
+    if self.size < 2:
+      return
+    
+    dummy = Node()
+    dummy.next = self.head
+    tail = dummy
+    width = 1
+    
+    while width < self.size:
+      tail = dummy
+      current = dummy.next
+      while current:
+        left = current
+        right = self._split(left, width)
+        current = self._split(right, width)
+        tail = self._merge_runs(left, right, tail, key, reverse)
+      width *= 2
+    
+    self.head = dummy.next
+    self.tail = tail
+
+  # Відрізає перші count вузлів і повертає початок решти
+  @staticmethod
+  def _split(node, count):
+    for _ in range(count - 1):
+      if node is None:
+        return None
+      node = node.next
+    if node is None:
+      return None
+    rest = node.next
+    node.next = None
+    return rest
+
+  # Зливає дві серії після tail і повертає новий хвіст
+  @staticmethod
+  def _merge_runs(left, right, tail, key, reverse):
+    if right is not None:
+      left_key = left.data if key is None else key(left.data)
+      right_key = right.data if key is None else key(right.data)
+      while True:
+        if (left_key < right_key) if reverse else (right_key < left_key):
+          tail.next = right
+          tail = right
+          right = right.next
+          if right is None:
+            break
+          right_key = right.data if key is None else key(right.data)
+        else:
+          tail.next = left
+          tail = left
+          left = left.next
+          if left is None:
+            break
+          left_key = left.data if key is None else key(left.data)
     
-    return sorted_head
+    tail.next = left or right
+    while tail.next:
+      tail = tail.next
+    return tail
 
   # Новий метод: Об'єднання двох відсортованих списків
+  # Кожен елемент додається в кінець за O(1), тож злиття лінійне
   @staticmethod
   def merge_sorted_lists(list1: 'LinkedList', list2: 'LinkedList') -> 'LinkedList':
-    merged = LinkedList()
-    cur1 = list1.head
-    cur2 = list2.head
-    
+    return type(list1).from_iterable(LinkedList._merge_data(list1.head, list2.head))
+
+  @staticmethod
+  def _merge_data(cur1, cur2):
     while cur1 and cur2:
       if cur1.data <= cur2.data:
-        merged.insert_at_end(cur1.data)
+        yield cur1.data
         cur1 = cur1.next
       else:
-        merged.insert_at_end(cur2.data)
+        yield cur2.data
         cur2 = cur2.next
     
-    while cur1:
-      merged.insert_at_end(cur1.data)
-      cur1 = cur1.next
-    
-    while cur2:
-      merged.insert_at_end(cur2.data)
-      cur2 = cur2.next
-    
-    return merged
+    rest = cur1 or cur2
+    while rest:
+      yield rest.data
+      rest = rest.next
+
+
+class DoublyNode(Node):
+  __slots__ = ("prev",)
+
+  def __init__(self, data=None):
+    super().__init__(data)
+    self.prev = None
+
+
+# Вузол з міткою порядку: мітки зростають уздовж списку, тож порівняння
+# двох вузлів за міткою дає їхній порядок у списку за O(1)
+class LabeledNode(DoublyNode):
+  __slots__ = ("label",)
+
+  def __init__(self, data=None):
+    super().__init__(data)
+    self.label = 0
+
+  def __lt__(self, other):
+    return self.label < other.label
+
+
+# Зв'язний список з індексом значення -> вузли: пошук і перевірка належності
+# за O(1). Вузли кожного значення (k входжень) зберігаються в купі за мітками
+# порядку, тож delete_node, як і раніше, видаляє перше входження за O(log k),
+# а вставка в будь-яке місце списку оновлює індекс за O(log k) без проходу списком.
+# Мітки - цілі числа в універсумі 2^label_bits. Нова мітка береться посередині
+# між сусідами; якщо місця немає, перерозподіляються мітки найменшого
+# вирівняного вікна навколо вузла, щільність якого нижча за LABEL_DENSITY^-i
+# (спрощений алгоритм Бендера та ін.), - амортизовано O(log n) на вставку
+class IndexedLinkedList(LinkedList):
+  node_class = LabeledNode
+
+  def __init__(self):
+    super().__init__()
+    self.index = {}
+    self.label_bits = LABEL_BITS
+
+  def __contains__(self, data):
+    return data in self.index
+
+  def insert_at_beginning(self, data):
+    super().insert_at_beginning(data)
+    node = self.head
+    if node.next:
+      node.next.prev = node
+    self._assign_label(node)
+    self._add_to_index(node)
+
+  def insert_at_end(self, data):
+    prev_tail = self.tail
+    super().insert_at_end(data)
+    self.tail.prev = prev_tail
+    self._assign_label(self.tail)
+    self._add_to_index(self.tail)
+
+  def insert_after(self, prev_node: LabeledNode, data):
+    super().insert_after(prev_node, data)
+    if prev_node is None:
+      return
+    node = prev_node.next
+    node.prev = prev_node
+    if node.next:
+      node.next.prev = node
+    self._assign_label(node)
+    self._add_to_index(node)
+
+  def delete_node(self, key):
+    bucket = self.index.get(key)
+    if not bucket:
+      return
+    node = heapq.heappop(bucket)
+    if not bucket:
+      del self.index[key]
+
+    if node.prev:
+      node.prev.next = node.next
+    else:
+      self.head = node.next
+    if node.next:
+      node.next.prev = node.prev
+    else:
+      self.tail = node.prev
+    self.size -= 1
+
+  def search_element(self, data) -> LabeledNode | None:
+    bucket = self.index.get(data)
+    return bucket[0] if bucket else None
+
+  def reverse(self):
+    super().reverse()
+    self._reindex()
+
+  def insertion_sort(self, key=None, reverse=False):
+    super().insertion_sort(key=key, reverse=reverse)
+    self._reindex()
+
+  def merge_sort(self, key=None, reverse=False):
+    super().merge_sort(key=key, reverse=reverse)
+    self._reindex()
+
+  def _add_to_index(self, node):
+    heapq.heappush(self.index.setdefault(node.data, []), node)
+
+  # Мітка для щойно зв'язаного вузла. Вставки на краях беруть фіксований
+  # крок, щоб послідовне додавання не ділило проміжок навпіл щоразу
+  def _assign_label(self, node):
+    universe = 1 << self.label_bits
+    step = 1 << (self.label_bits // 2)
+    prev, next_node = node.prev, node.next
+    lower = prev.label if prev else -1
+    upper = next_node.label if next_node else universe
+
+    if prev is None and next_node is None:
+      node.label = universe // 2
+    elif next_node is None and lower + step < universe:
+      node.label = lower + step
+    elif prev is None and upper - step >= 0:
+      node.label = upper - step
+    elif upper - lower >= 2:
+      node.label = (lower + upper) // 2
+    else:
+      node.label = max(lower, 0)
+      self._relabel(node)
+
+  # Рівномірно перерозподіляє мітки найменшого вирівняного вікна [low, low + 2^i),
+  # що містить node і досить розріджене. Уздовж списку мітки не спадають,
+  # тож вікно - суцільний відрізок списку навколо node
+  def _relabel(self, node):
+    for i in range(1, self.label_bits + 1):
+      low = node.label >> i << i
+      high = low + (1 << i)
+      first = node
+      while first.prev is not None and first.prev.label >= low:
+        first = first.prev
+      count = 0
+      current = first
+      while current is not None and current.label < high:
+        count += 1
+        current = current.next
+      if count < (1 << i) / LABEL_DENSITY ** i:
+        self._spread_labels(first, count, low, (1 << i) // count)
+        return
+    # Увесь універсум надто щільний - подвоюємо розрядність міток.
+    # Порядок міток зберігається, тож купи в індексі лишаються коректними
+    self.label_bits *= 2
+    self._spread_labels(self.head, self.size, 0, (1 << self.label_bits) // self.size)
+
+  def _spread_labels(self, first, count, low, gap):
+    for k in range(count):
+      first.label = low + k * gap
+      first = first.next
+
+  # Відновлює зворотні посилання, мітки та індекс за один прохід.
+  # Вузли додаються в купи в порядку списку, тож кожна купа вже впорядкована
+  def _reindex(self):
+    index = {}
+    gap = (1 << self.label_bits) // (self.size + 1)
+    label = gap
+    prev = None
+    current = self.head
+    while current:
+      current.prev = prev
+      current.label = label
+      index.setdefault(current.data, []).append(current)
+      label += gap
+      prev = current
+      current = current.next
+    self.index = index
+
+
+# Компактний варіант зв'язного списку: вузли зберігаються в паралельних
+# масивах (дані + індекс наступного), видалені слоти повторно
+# використовуються через список вільних слотів
+class ArrayLinkedList:
+  def __init__(self):
+    self.head = NIL
+    self.tail = NIL
+    self.size = 0
+    self.free = NIL
+    self.data = []
+    self.next_index = array('q')
+
+  @classmethod
+  def from_iterable(cls, iterable):
+    linked_list = cls()
+    linked_list.extend(iterable)
+    return linked_list
+
+  def __len__(self):
+    return self.size
+
+  def __iter__(self):
+    for index in self._indices():
+      yield self.data[index]
+
+  def _indices(self):
+    index = self.head
+    while index != NIL:
+      yield index
+      index = self.next_index[index]
+
+  def _allocate(self, data):
+    index = self.free
+    if index == NIL:
+      self.data.append(data)
+      self.next_index.append(NIL)
+      return len(self.data) - 1
+    self.free = self.next_index[index]
+    self.data[index] = data
+    self.next_index[index] = NIL
+    return index
+
+  def _release(self, index):
+    self.data[index] = None
+    self.next_index[index] = self.free
+    self.free = index
+
+  def insert_at_beginning(self, data):
+    index = self._allocate(data)
+    self.next_index[index] = self.head
+    self.head = index
+    if self.tail == NIL:
+      self.tail = index
+    self.size += 1
+
+  def insert_at_end(self, data):
+    index = self._allocate(data)
+    if self.head == NIL:
+      self.head = index
+    else:
+      self.next_index[self.tail] = index
+    self.tail = index
+    self.size += 1
+
+  def extend(self, iterable):
+    for data in iterable:
+      self.insert_at_end(data)
+
+  # prev_index - індекс слота, отриманий від search_element
+  def insert_after(self, prev_index, data):
+    if prev_index is None or prev_index == NIL:
+      print("Попереднього вузла не існує.")
+      return
+    index = self._allocate(data)
+    self.next_index[index] = self.next_index[prev_index]
+    self.next_index[prev_index] = index
+    if prev_index == self.tail:
+      self.tail = index
+    self.size += 1
+
+  def delete_node(self, key):
+    prev = NIL
+    index = self.head
+    while index != NIL and self.data[index] != key:
+      prev = index
+      index = self.next_index[index]
+    if index == NIL:
+      return
+    if prev == NIL:
+      self.head = self.next_index[index]
+    else:
+      self.next_index[prev] = self.next_index[index]
+    if index == self.tail:
+      self.tail = prev
+    self.size -= 1
+    self._release(index)
+
+  def search_element(self, data) -> int | None:
+    for index in self._indices():
+      if self.data[index] == data:
+        return index
+    return None
+
+  def print_list(self):
+    for data in self:
+      print(data)
+
+  def reverse(self):
+    prev = NIL
+    index = self.head
+    self.tail = index
+    while index != NIL:
+      next_index = self.next_index[index]
+      self.next_index[index] = prev
+      prev = index
+      index = next_index
+    self.head = prev
+
+  # Перезв'язує слоти в порядку order
+  def _relink(self, order):
+    if not order:
+      return
+    next_index = self.next_index
+    for current, following in zip(order, order[1:]):
+      next_index[current] = following
+    next_index[order[-1]] = NIL
+    self.head = order[0]
+    self.tail = order[-1]
+
+  # Стабільне сортування вставками по масиву індексів
+  def insertion_sort(self, key=None, reverse=False):
+    order = []
+    for index in self._indices():
+      value = self.data[index]
+      position = len(order)
+      while position > 0 and LinkedList._precedes(value, self.data[order[position - 1]], key, reverse):
+        position -= 1
+      order.insert(position, index)
+    self._relink(order)
+
+  # Сортування за O(n log n): стабільно впорядковує індекси і перезв'язує їх
+  def sort(self, key=None, reverse=False):
+    data = self.data
+    if key is None:
+      order = sorted(self._indices(), key=data.__getitem__, reverse=reverse)
+    else:
+      order = sorted(self._indices(), key=lambda index: key(data[index]), reverse=reverse)
+    self._relink(order)
+
+  merge_sort = sort
+
+  @staticmethod
+  def merge_sorted_lists(list1: 'ArrayLinkedList', list2: 'ArrayLinkedList') -> 'ArrayLinkedList':
+    return type(list1).from_iterable(heapq.merge(list1, list2))
+
 
 def main():
     linked_list = LinkedList()
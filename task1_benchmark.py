@@ -0,0 +1,121 @@
+import random
+import time
+import tracemalloc
+from itertools import repeat
+
+from task1 import ArrayLinkedList, LinkedList
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+MEMORY_SIZE = 1_000_000
+OPERATIONS_SIZE = 200_000
+LIST_CLASSES = (LinkedList, ArrayLinkedList)
+# Сортування вставками на випадкових даних росте як O(n^2),
+# тому понад цей розмір його не запускаємо
+INSERTION_SORT_RANDOM_LIMIT = 10_000
+
+
+def random_data(size):
+    data = list(range(size))
+    random.shuffle(data)
+    return data
+
+
+def nearly_sorted_data(size, swaps=2):
+    data = list(range(size))
+    for _ in range(swaps):
+        i, j = random.randrange(size), random.randrange(size)
+        data[i], data[j] = data[j], data[i]
+    return data
+
+
+def measure(data, method_name):
+    linked_list = LinkedList.from_iterable(data)
+    start = time.perf_counter()
+    getattr(linked_list, method_name)()
+    return time.perf_counter() - start
+
+
+def format_time(seconds):
+    return "—" if seconds is None else f"{seconds:.4f}"
+
+
+def benchmark_sorts(sizes=SIZES):
+    print(f"{'Дані':<16}{'Розмір':>10}{'insertion_sort':>16}{'merge_sort':>14}{'sort':>10}")
+    print("-" * 66)
+    for label, generator in (("випадкові", random_data), ("майже сортовані", nearly_sorted_data)):
+        for size in sizes:
+            random.seed(size)
+            data = generator(size)
+            if label == "випадкові" and size > INSERTION_SORT_RANDOM_LIMIT:
+                insertion_time = None
+            else:
+                insertion_time = measure(data, "insertion_sort")
+            merge_time = measure(data, "merge_sort")
+            auto_time = measure(data, "sort")
+            print(f"{label:<16}{size:>10,}{format_time(insertion_time):>16}"
+                  f"{format_time(merge_time):>14}{format_time(auto_time):>10}")
+
+
+# Пам'ять самої структури: усі елементи посилаються на один і той самий об'єкт,
+# тож вартість корисного навантаження не враховується
+def bytes_per_element(list_class, size):
+    tracemalloc.start()
+    linked_list = list_class.from_iterable(repeat(0, size))
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del linked_list
+    return allocated / size
+
+
+def benchmark_memory(size=MEMORY_SIZE):
+    print(f"{'Клас':<18}{'Байт на елемент':>18}")
+    print("-" * 36)
+    for list_class in LIST_CLASSES:
+        print(f"{list_class.__name__:<18}{bytes_per_element(list_class, size):>18.1f}")
+
+
+def ops_per_second(operation, count):
+    start = time.perf_counter()
+    operation()
+    return count / (time.perf_counter() - start)
+
+
+def prepend_all(list_class, data):
+    linked_list = list_class()
+    for value in data:
+        linked_list.insert_at_beginning(value)
+
+
+def benchmark_operations(size=OPERATIONS_SIZE):
+    data = random_data(size)
+    results = {}
+    for list_class in LIST_CLASSES:
+        linked_list = list_class()
+        results[list_class.__name__] = {
+            "insert_at_end": ops_per_second(lambda: linked_list.extend(data), size),
+            "insert_at_beginning": ops_per_second(lambda: prepend_all(list_class, data), size),
+            # Пошук відсутнього значення - повний прохід, рахуємо переглянуті вузли
+            "search_element": ops_per_second(lambda: linked_list.search_element(-1), size),
+            "reverse": ops_per_second(linked_list.reverse, size),
+            "sort": ops_per_second(linked_list.sort, size),
+            # Після сортування кожне видалення знаходить елемент на початку списку
+            "delete_node": ops_per_second(lambda: [linked_list.delete_node(value) for value in range(size)], size),
+        }
+
+    names = list(results)
+    print(f"{'Операція (оп/с)':<22}" + "".join(f"{name:>18}" for name in names))
+    print("-" * (22 + 18 * len(names)))
+    for operation in results[names[0]]:
+        print(f"{operation:<22}" + "".join(f"{results[name][operation]:>18,.0f}" for name in names))
+
+
+def main():
+    benchmark_sorts()
+    print()
+    benchmark_memory()
+    print()
+    benchmark_operations()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,37 +1,336 @@
+import hashlib
 import heapq
+import math
+import os
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+
+LABEL_LIMIT = 100
+SPRING_LAYOUT_LIMIT = 500
+LAYOUT_CACHE_SIZE = 8
+
+# Граф у форматі CSR: сусіди вершини i - indices[indptr[i]:indptr[i + 1]],
+# ваги ребер - у weights на тих самих позиціях. matrix - та сама розріджена
+# матриця SciPy, що спільно використовує ці масиви: будується один раз
+CSRGraph = namedtuple('CSRGraph', ['indptr', 'indices', 'weights', 'labels', 'index', 'matrix'])
 
 def deijkstra(graph, start):
     distances = {v: float('inf') for v in graph}
-    distances[start] = 0
     predecessors = {v: None for v in graph}
     
-    heap = [(0, start)]  # бінарна купа: (відстань, вершина)
+    for _ in _settle(graph, [start], distances, predecessors):
+        pass
+    
+    return distances, predecessors
+
+# Спільне ядро Дейкстри: по черзі повертає вершини, щойно їхня відстань
+# остаточна, тож виклик може зупинитися раніше. Словники заповнюються ліниво.
+# З heuristic купа впорядковується за відстань + оцінка до цілі (A*)
+def _settle(graph, sources, distances, predecessors, cutoff=None, heuristic=None):
+    heap = []  # бінарна купа: (пріоритет, вершина)
+    for source in sources:
+        distances[source] = 0
+        predecessors[source] = None
+        heap.append((heuristic(source) if heuristic else 0, source))
+    heapq.heapify(heap)
     visited = set()
     
     while heap:
-        dist, u = heapq.heappop(heap)  # O(log V)
+        _, u = heapq.heappop(heap)  # O(log V)
         
         if u in visited:
             continue
         visited.add(u)
+        yield u
         
+        dist = distances[u]
         for v, weight in graph[u]:
-            if v not in visited and dist + weight < distances[v]:
-                distances[v] = dist + weight
+            new_dist = dist + weight
+            if cutoff is not None and new_dist > cutoff:
+                continue
+            if v not in visited and new_dist < distances.get(v, float('inf')):
+                distances[v] = new_dist
                 predecessors[v] = u
-                heapq.heappush(heap, (distances[v], v))  # O(log V)
+                priority = new_dist + heuristic(v) if heuristic else new_dist
+                heapq.heappush(heap, (priority, v))  # O(log V)
+
+# Шлях між двома вершинами: пошук зупиняється, щойно ціль дістано з купи.
+# heuristic(v) вмикає A*: вона має не переоцінювати відстань до цілі
+# і бути монотонною, як-от евклідова відстань для графа доріг
+def shortest_path(graph, source, target, heuristic=None):
+    distances, predecessors = {}, {}
+    for u in _settle(graph, [source], distances, predecessors, heuristic=heuristic):
+        if u == target:
+            return distances[u], get_path(predecessors, source, target)
+    return float('inf'), []
+
+def euclidean_heuristic(coordinates, target):
+    target_point = coordinates[target]
+    return lambda v: math.dist(coordinates[v], target_point)
+
+# Двонапрямлена Дейкстра: пошук одночасно від source і від target, зупинка,
+# коли сума вершин обох куп не менша за найкращий знайдений шлях.
+# Для орієнтованого графа потрібен reverse_graph з оберненими ребрами
+def bidirectional_shortest_path(graph, source, target, reverse_graph=None):
+    if source == target:
+        return 0, [source]
+    
+    graphs = (graph, graph if reverse_graph is None else reverse_graph)
+    distances = ({source: 0}, {target: 0})
+    predecessors = ({source: None}, {target: None})
+    heaps = ([(0, source)], [(0, target)])
+    visited = (set(), set())
+    best, meeting = float('inf'), None
+    
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        dist, u = heapq.heappop(heaps[side])
+        
+        if u in visited[side]:
+            continue
+        visited[side].add(u)
+        
+        own, other = distances[side], distances[1 - side]
+        for v, weight in graphs[side][u]:
+            new_dist = dist + weight
+            if v not in visited[side] and new_dist < own.get(v, float('inf')):
+                own[v] = new_dist
+                predecessors[side][v] = u
+                heapq.heappush(heaps[side], (new_dist, v))
+            if v in other and own[v] + other[v] < best:
+                best, meeting = own[v] + other[v], v
     
+    if meeting is None:
+        return float('inf'), []
+    forward = get_path(predecessors[0], source, meeting)
+    backward = get_path(predecessors[1], target, meeting)[::-1]
+    return best, forward + backward[1:]
+
+# Дейкстра з кількох джерел одночасно (найближчий об'єкт) з необов'язковим
+# радіусом cutoff. Повертає лише вершини, досяжні в межах радіуса
+def multi_source_deijkstra(graph, sources, cutoff=None):
+    distances, predecessors = {}, {}
+    for _ in _settle(graph, sources, distances, predecessors, cutoff):
+        pass
     return distances, predecessors
 
+# Перетворює словник суміжності на цілочисельні масиви CSR
+def to_csr(graph):
+    labels = list(graph)
+    index = {v: i for i, v in enumerate(labels)}
+    
+    degrees = np.fromiter((len(graph[v]) for v in labels), dtype=np.int64, count=len(labels))
+    indptr = np.zeros(len(labels) + 1, dtype=np.int64)
+    np.cumsum(degrees, out=indptr[1:])
+    edge_count = int(indptr[-1])
+    
+    index_dtype = np.int32 if len(labels) < 2 ** 31 else np.int64
+    indices = np.fromiter((index[v] for u in labels for v, _ in graph[u]), dtype=index_dtype, count=edge_count)
+    weights = np.fromiter((w for u in labels for _, w in graph[u]), dtype=np.float64, count=edge_count)
+    
+    # Конструктор csr_matrix перевіряє й копіює масиви (зводячи індекси до
+    # спільного типу), тож у CSRGraph зберігаються масиви самої матриці
+    matrix = csr_matrix((weights, indices, indptr), shape=(len(labels), len(labels)))
+    return CSRGraph(matrix.indptr, matrix.indices, matrix.data, labels, index, matrix)
+
+# Дейкстра на масивах CSR: відстані та попередники зберігаються в масивах
+# NumPy, а сам цикл виконує скомпільована реалізація з SciPy.
+# Попередник -1 означає, що вершина є стартовою або недосяжна
+def csr_deijkstra(csr, start, cutoff=None):
+    distances, predecessors = csgraph_dijkstra(
+        csr.matrix, indices=csr.index[start], return_predecessors=True,
+        limit=np.inf if cutoff is None else cutoff)
+    predecessors[predecessors < 0] = -1
+    return distances, predecessors
+
+# Переводить результат csr_deijkstra у словники, як повертає deijkstra
+def csr_to_dicts(csr, distances, predecessors):
+    labels = csr.labels
+    distances_dict = {}
+    predecessors_dict = {}
+    for i, (dist, pred) in enumerate(zip(distances.tolist(), predecessors.tolist())):
+        distances_dict[labels[i]] = dist
+        predecessors_dict[labels[i]] = labels[pred] if pred >= 0 else None
+    return distances_dict, predecessors_dict
+
+# Граф у процесі-виконавці: передається один раз через initializer,
+# а не з кожним завданням
+_worker_matrix = None
+
+def _init_worker(matrix):
+    global _worker_matrix
+    _worker_matrix = matrix
+
+def _distances_chunk(source_indices):
+    return source_indices, csgraph_dijkstra(_worker_matrix, indices=source_indices)
+
+# Відстані від кількох джерел паралельно на всіх ядрах. Генератор повертає
+# (джерело, масив відстаней) у міру готовності; позиції в масиві
+# відповідають порядку вершин list(graph). Якщо споживач зупиниться раніше,
+# завдання в черзі скасовуються - дочекатися треба лише тих, що вже виконуються
+def many_sources(graph, sources, max_workers=None, chunk_size=None):
+    csr = graph if isinstance(graph, CSRGraph) else to_csr(graph)
+    source_indices = [csr.index[source] for source in sources]
+    max_workers = max_workers or os.cpu_count()
+    chunk_size = chunk_size or max(1, math.ceil(len(source_indices) / (max_workers * 4)))
+    chunks = [source_indices[i:i + chunk_size] for i in range(0, len(source_indices), chunk_size)]
+    
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(csr.matrix,)) as executor:
+        futures = [executor.submit(_distances_chunk, chunk) for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                chunk, rows = future.result()
+                for i, row in zip(chunk, rows):
+                    yield csr.labels[i], row
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+# Щільна матриця відстаней між усіма парами вершин у порядку list(graph)
+def all_pairs(graph, max_workers=None):
+    csr = to_csr(graph)
+    matrix = np.empty((len(csr.labels), len(csr.labels)))
+    for source, row in many_sources(csr, csr.labels, max_workers=max_workers):
+        matrix[csr.index[source]] = row
+    return matrix, csr.labels
+
 def get_path(predecessors, start, end):
     path, current = [], end
-    while current:
+    while current is not None:
         path.append(current)
         current = predecessors[current]
     return path[::-1] if path and path[-1] == start else []
 
+# Обгортка над графом для повторних запитів: дерева найкоротших шляхів
+# кешуються для cache_size останніх джерел (LRU), а таблиці орієнтирів
+# (ALT) прискорюють A* між довільними вершинами. Будь-яка зміна ребер
+# скидає і кеш, і таблиці. Орієнтири розраховані на неорієнтований граф
+class ShortestPathGraph:
+    def __init__(self, graph, cache_size=32):
+        self.graph = graph
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._landmarks = None
+        self._landmark_table = None
+
+    def add_edge(self, u, v, weight):
+        self.graph.setdefault(u, []).append((v, weight))
+        self.graph.setdefault(v, []).append((u, weight))
+        self.invalidate()
+
+    def remove_edge(self, u, v):
+        self.graph[u] = [(x, w) for x, w in self.graph[u] if x != v]
+        self.graph[v] = [(x, w) for x, w in self.graph[v] if x != u]
+        self.invalidate()
+
+    def invalidate(self):
+        self._cache.clear()
+        self._landmarks = None
+        self._landmark_table = None
+
+    # Результат спільний для всіх викликів, його не слід змінювати
+    def deijkstra(self, start):
+        if start in self._cache:
+            self._cache.move_to_end(start)
+            return self._cache[start]
+        
+        result = deijkstra(self.graph, start)
+        self._cache[start] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def shortest_path(self, source, target):
+        if source in self._cache:
+            distances, predecessors = self.deijkstra(source)
+            return distances[target], get_path(predecessors, source, target)
+        
+        heuristic = self._landmark_heuristic(target) if self._landmark_table else None
+        return shortest_path(self.graph, source, target, heuristic)
+
+    # Обирає count орієнтирів методом найвіддаленішої точки
+    # і зберігає відстані від кожного з них до всіх вершин
+    def build_landmarks(self, count=8):
+        csr = to_csr(self.graph)
+        landmarks = [0]
+        rows = []
+        closest = np.full(len(csr.labels), np.inf)
+        while True:
+            distances, _ = csr_deijkstra(csr, csr.labels[landmarks[-1]])
+            rows.append(distances)
+            np.minimum(closest, distances, out=closest)
+            if len(landmarks) == count:
+                break
+            reachable = np.where(np.isfinite(closest), closest, -1)
+            landmarks.append(int(reachable.argmax()))
+        
+        self._set_landmarks(csr.labels, [csr.labels[i] for i in landmarks], np.vstack(rows))
+
+    def _set_landmarks(self, labels, landmarks, table):
+        self._landmarks = landmarks
+        self._landmark_table = dict(zip(labels, map(tuple, table.T.tolist())))
+
+    # Нерівність трикутника: |d(l, t) - d(l, v)| не більша за d(v, t)
+    def _landmark_heuristic(self, target):
+        table = self._landmark_table
+        target_row = table[target]
+        inf = float('inf')
+        return lambda v: max(
+            (abs(a - b) for a, b in zip(target_row, table[v]) if a != inf and b != inf),
+            default=0)
+
+    # Мітки вершин у файл не пишуться: np.array псує кортежі та змішані типи.
+    # Стовпці таблиці зберігаються в канонічному порядку вершин (за repr),
+    # орієнтири - як номери в цьому порядку
+    def save_landmarks(self, path):
+        if self._landmark_table is None:
+            raise ValueError("Таблиці орієнтирів ще не побудовані")
+        vertices = self._canonical_vertices()
+        position = {v: i for i, v in enumerate(vertices)}
+        table = np.array([self._landmark_table[v] for v in vertices]).T
+        np.savez(_npz_path(path), landmarks=np.array([position[v] for v in self._landmarks]),
+                 table=table, fingerprint=self._fingerprint())
+
+    # Таблиці приймаються лише для того самого графа: для іншого графа
+    # з тією самою кількістю вершин і ребер евристика стала б недопустимою
+    # і A* мовчки повертав би неправильні шляхи
+    def load_landmarks(self, path):
+        with np.load(_npz_path(path)) as data:
+            if 'fingerprint' not in data or str(data['fingerprint']) != self._fingerprint():
+                raise ValueError("Таблиці орієнтирів побудовані для іншого графа")
+            vertices = self._canonical_vertices()
+            landmarks = [vertices[i] for i in data['landmarks'].tolist()]
+            self._set_landmarks(vertices, landmarks, data['table'])
+
+    def _canonical_vertices(self):
+        return sorted(self.graph, key=repr)
+
+    # Відбиток графа: SHA-256 від відсортованого списку ребер з вагами
+    def _fingerprint(self):
+        edges = sorted(f"{u!r}\t{v!r}\t{weight!r}" for u, edges in self.graph.items() for v, weight in edges)
+        vertices = [repr(v) for v in self._canonical_vertices()]
+        digest = hashlib.sha256()
+        for line in vertices + ["--"] + edges:
+            digest.update(line.encode())
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+# np.savez додає .npz до шляху без цього суфікса, тож load має робити те саме
+def _npz_path(path):
+    path = os.fspath(path)
+    return path if path.endswith('.npz') else path + '.npz'
+
 def visualize_shortest(graph, distances, predecessors, start):
     G = nx.Graph()
     for u in graph:
@@ -62,6 +361,102 @@ def visualize_shortest(graph, distances, predecessors, start):
     plt.savefig('deijkstra_graph.png', dpi=150)
     plt.close()
 
+# Кеш розкладок: граф зберігається разом із позиціями, тож його id
+# не може бути перевикористаний, доки запис у кеші
+_layout_cache = OrderedDict()
+
+# Позиції вершин, що обчислюються один раз і повторно використовуються.
+# Для великих графів замість spring_layout (O(n^2) на ітерацію)
+# використовується спектральна розкладка на розрідженій матриці
+def graph_layout(graph, seed=42):
+    edge_count = sum(len(edges) for edges in graph.values())
+    cached = _layout_cache.get(id(graph))
+    if cached and cached[0] is graph and cached[1] == edge_count:
+        _layout_cache.move_to_end(id(graph))
+        return cached[2]
+    
+    G = nx.Graph()
+    G.add_nodes_from(graph)
+    G.add_edges_from((u, v) for u in graph for v, _ in graph[u])
+    if len(G) <= SPRING_LAYOUT_LIMIT:
+        pos = nx.spring_layout(G, seed=seed)
+    else:
+        pos = nx.spectral_layout(G)
+    
+    _layout_cache[id(graph)] = (graph, edge_count, pos)
+    if len(_layout_cache) > LAYOUT_CACHE_SIZE:
+        _layout_cache.popitem(last=False)
+    return pos
+
+# Швидка візуалізація без pyplot: ребра малюються одним LineCollection,
+# підписи проріджуються понад label_limit вершин, subtree_only залишає
+# лише дерево найкоротших шляхів. Працює без дисплея й у фоновому потоці
+def render_shortest(graph, distances, predecessors, start, filename='deijkstra_graph.png',
+                    pos=None, subtree_only=False, label_limit=LABEL_LIMIT):
+    pos = pos or graph_layout(graph)
+    inf = float('inf')
+    if subtree_only:
+        vertices = [v for v in graph if distances.get(v, inf) < inf]
+    else:
+        vertices = list(graph)
+    small = len(vertices) <= label_limit
+    
+    fig = Figure(figsize=(10, 8))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    
+    if not subtree_only:
+        edges = [(pos[u], pos[v]) for u in graph for v, _ in graph[u]]
+        ax.add_collection(LineCollection(edges, colors='lightgray', linewidths=2 if small else 0.5, zorder=1))
+    tree_edges = [(pos[p], pos[v]) for v, p in predecessors.items() if p is not None]
+    ax.add_collection(LineCollection(tree_edges, colors='red', linewidths=3 if small else 1, zorder=2))
+    
+    xy = np.array([pos[v] for v in vertices])
+    colors = ['lightgreen' if v == start else 'lightblue' for v in vertices]
+    ax.scatter(xy[:, 0], xy[:, 1], c=colors, s=700 if small else 10,
+               edgecolors='black', linewidths=1 if small else 0.2, zorder=3)
+    
+    step = math.ceil(len(vertices) / label_limit)
+    labelled = vertices[::step]
+    if start not in labelled:
+        labelled.append(start)
+    for v in labelled:
+        x, y = pos[v]
+        ax.text(x, y, f"{v}\n({distances.get(v, inf):g})", ha='center', va='center',
+                fontsize=10 if small else 6, fontweight='bold', zorder=4)
+    
+    if small:
+        if subtree_only:
+            weighted_edges = [(p, v, w) for v, p in predecessors.items() if p is not None
+                              for u, w in graph[p] if u == v]
+        else:
+            weighted_edges = [(u, v, w) for u in graph for v, w in graph[u]]
+        seen = set()
+        for u, v, w in weighted_edges:
+            if frozenset((u, v)) in seen:
+                continue
+            seen.add(frozenset((u, v)))
+            (x1, y1), (x2, y2) = pos[u], pos[v]
+            ax.text((x1 + x2) / 2, (y1 + y2) / 2, str(w), ha='center', va='center', fontsize=8,
+                    bbox={'boxstyle': 'round', 'fc': 'white', 'ec': 'none'}, zorder=4)
+    
+    ax.set_title(f"Найкоротші шляхи від '{start}' (алгоритм Дейкстри)")
+    ax.autoscale_view()
+    ax.axis('off')
+    fig.tight_layout()
+    fig.savefig(filename, dpi=150)
+    return filename
+
+_render_executor = None
+
+# Рендеринг у фоновому потоці: обчислення шляхів не чекає на PNG.
+# Повертає Future з ім'ям збереженого файлу
+def render_shortest_async(*args, **kwargs):
+    global _render_executor
+    if _render_executor is None:
+        _render_executor = ThreadPoolExecutor(max_workers=1)
+    return _render_executor.submit(render_shortest, *args, **kwargs)
+
 def main():
     graph = {
         'A': [('B', 4), ('C', 2)],
@@ -81,6 +476,17 @@ def main():
         path = get_path(predecessors, start, v)
         print(f"{v}: відстань = {distances[v]}, шлях: {' → '.join(path)}")
 
+    distance, path = shortest_path(graph, 'A', 'F')
+    print(f"\nA → F з ранньою зупинкою: відстань = {distance}, шлях: {' → '.join(path)}")
+    distance, path = bidirectional_shortest_path(graph, 'A', 'F')
+    print(f"A → F двонапрямлено: відстань = {distance}, шлях: {' → '.join(path)}")
+
+    facilities = ['A', 'F']
+    nearest, _ = multi_source_deijkstra(graph, facilities, cutoff=5)
+    print(f"Вершини в радіусі 5 від {facilities}:")
+    for v in sorted(nearest):
+        print(f"{v}: відстань до найближчого = {nearest[v]}")
+
     visualize_shortest(graph, distances, predecessors, start)
     print("\nГраф збережено: deijkstra_graph.png")
 
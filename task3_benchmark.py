@@ -0,0 +1,191 @@
+import math
+import os
+import random
+import sys
+import time
+
+from task3 import (
+    ShortestPathGraph,
+    all_pairs,
+    bidirectional_shortest_path,
+    csr_deijkstra,
+    deijkstra,
+    euclidean_heuristic,
+    shortest_path,
+    to_csr,
+)
+
+GRID_SIZE = 150
+CSR_GRID_SIZE = 400
+ALL_PAIRS_GRID_SIZE = 100
+QUERIES = 20
+CHECK_QUERIES = 20
+
+
+# Граф, що рахує звернення до списків суміжності: кожна вершина,
+# відстань до якої стала остаточною, читається рівно один раз
+class CountingGraph(dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads = 0
+
+    def __getitem__(self, key):
+        self.reads += 1
+        return super().__getitem__(key)
+
+
+# Решітка, схожа на мережу доріг: вага ребра не менша за евклідову
+# відстань, тож евклідова евристика для A* допустима
+def grid_graph(size, seed=42):
+    rng = random.Random(seed)
+    coordinates = {}
+    graph = CountingGraph()
+    for x in range(size):
+        for y in range(size):
+            v = f"{x},{y}"
+            coordinates[v] = (x + rng.uniform(-0.3, 0.3), y + rng.uniform(-0.3, 0.3))
+            graph[v] = []
+    for x in range(size):
+        for y in range(size):
+            u = f"{x},{y}"
+            for nx_, ny_ in ((x + 1, y), (x, y + 1)):
+                if nx_ < size and ny_ < size:
+                    v = f"{nx_},{ny_}"
+                    weight = round(math.dist(coordinates[u], coordinates[v]) * rng.uniform(1, 1.5), 3)
+                    graph[u].append((v, weight))
+                    graph[v].append((u, weight))
+    return graph, coordinates
+
+
+def modes(coordinates):
+    return {
+        "deijkstra": lambda graph, s, t: deijkstra(graph, s)[0][t],
+        "shortest_path": lambda graph, s, t: shortest_path(graph, s, t)[0],
+        "bidirectional": lambda graph, s, t: bidirectional_shortest_path(graph, s, t)[0],
+        "astar": lambda graph, s, t: shortest_path(graph, s, t, euclidean_heuristic(coordinates, t))[0],
+    }
+
+
+def check_against_deijkstra(graph, coordinates, queries=CHECK_QUERIES, seed=1):
+    rng = random.Random(seed)
+    vertices = list(graph)
+    for _ in range(queries):
+        source, target = rng.choice(vertices), rng.choice(vertices)
+        expected = deijkstra(graph, source)[0][target]
+        for name, run in modes(coordinates).items():
+            assert math.isclose(run(graph, source, target), expected), (name, source, target)
+    print(f"Перевірка: {queries} запитів, усі режими збігаються з deijkstra")
+
+
+def benchmark_modes(graph, coordinates, queries=QUERIES, seed=2):
+    rng = random.Random(seed)
+    vertices = list(graph)
+    pairs = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(queries)]
+
+    print(f"{'Режим':<16}{'Вершин остаточно':>20}{'Час запиту, мс':>18}")
+    print("-" * 54)
+    for name, run in modes(coordinates).items():
+        graph.reads = 0
+        start = time.perf_counter()
+        for source, target in pairs:
+            run(graph, source, target)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<16}{graph.reads / queries:>20,.0f}{elapsed / queries * 1000:>18.2f}")
+
+
+# Пам'ять словника суміжності без урахування самих міток вершин
+def dict_graph_bytes(graph):
+    total = sys.getsizeof(graph)
+    for edges in graph.values():
+        total += sys.getsizeof(edges)
+        total += sum(sys.getsizeof(edge) + sys.getsizeof(edge[1]) for edge in edges)
+    return total
+
+
+def benchmark_csr(graph):
+    edge_count = sum(len(edges) for edges in graph.values())
+    source = next(iter(graph))
+
+    start = time.perf_counter()
+    csr = to_csr(graph)
+    build_time = time.perf_counter() - start
+
+    dict_bytes = dict_graph_bytes(graph)
+    array_bytes = csr.indptr.nbytes + csr.indices.nbytes + csr.weights.nbytes
+    map_bytes = sys.getsizeof(csr.labels) + sys.getsizeof(csr.index)
+
+    start = time.perf_counter()
+    distances, _ = deijkstra(graph, source)
+    dict_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    csr_distances, _ = csr_deijkstra(csr, source)
+    csr_time = time.perf_counter() - start
+
+    assert all(math.isclose(distances[v], csr_distances[csr.index[v]]) for v in graph)
+
+    print(f"Граф: {len(graph):,} вершин, {edge_count:,} ребер; побудова CSR {build_time:.2f} с")
+    print(f"{'Представлення':<16}{'Пам’ять, МБ':>14}{'Дейкстра, с':>14}{'Ребер/с':>16}")
+    print("-" * 60)
+    print(f"{'словник':<16}{dict_bytes / 2 ** 20:>14.1f}{dict_time:>14.3f}{edge_count / dict_time:>16,.0f}")
+    print(f"{'CSR':<16}{(array_bytes + map_bytes) / 2 ** 20:>14.1f}{csr_time:>14.3f}{edge_count / csr_time:>16,.0f}")
+
+
+def benchmark_query_index(graph, queries=QUERIES, seed=3):
+    rng = random.Random(seed)
+    vertices = list(graph)
+    sources = [rng.choice(vertices) for _ in range(3)]
+    pairs = [(rng.choice(sources), rng.choice(vertices)) for _ in range(queries)]
+
+    indexed = ShortestPathGraph(graph)
+    start = time.perf_counter()
+    indexed.build_landmarks()
+    print(f"Побудова таблиць орієнтирів: {time.perf_counter() - start:.2f} с")
+
+    def average_ms(run):
+        start = time.perf_counter()
+        for source, target in pairs:
+            run(source, target)
+        return (time.perf_counter() - start) / queries * 1000
+
+    print(f"{'Запит':<24}{'Час запиту, мс':>18}")
+    print("-" * 42)
+    print(f"{'shortest_path':<24}{average_ms(lambda s, t: shortest_path(graph, s, t)):>18.3f}")
+    print(f"{'ALT (орієнтири)':<24}{average_ms(indexed.shortest_path):>18.3f}")
+    for source in sources:
+        indexed.deijkstra(source)
+    print(f"{'кешоване дерево':<24}{average_ms(indexed.shortest_path):>18.3f}")
+
+
+def benchmark_all_pairs(graph):
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= os.cpu_count():
+        worker_counts.append(worker_counts[-1] * 2)
+
+    print(f"Матриця відстаней для {len(graph):,} вершин")
+    print(f"{'Процесів':<12}{'Час, с':>10}{'Прискорення':>14}")
+    print("-" * 36)
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        all_pairs(graph, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:<12}{elapsed:>10.2f}{baseline / elapsed:>14.2f}")
+
+
+def main():
+    graph, coordinates = grid_graph(GRID_SIZE)
+    print(f"Решітка {GRID_SIZE}x{GRID_SIZE}: {len(graph):,} вершин")
+    check_against_deijkstra(graph, coordinates)
+    benchmark_modes(graph, coordinates)
+    print()
+    benchmark_query_index(graph)
+    print()
+    benchmark_csr(grid_graph(CSR_GRID_SIZE)[0])
+    print()
+    benchmark_all_pairs(grid_graph(ALL_PAIRS_GRID_SIZE)[0])
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,14 @@
+import operator
 import uuid
 
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+LABEL_LIMIT = 100
 
 
 class Node:
@@ -54,6 +61,194 @@ def heap_to_tree(heap):
             nodes[i].right = nodes[2 * i + 2]
     return nodes[0]
 
+# Координати вузлів купи напряму з індексів: вузол i лежить на глибині
+# d = floor(log2(i + 1)) з номером o = i + 1 - 2^d у своєму рівні. Розташування
+# збігається з add_edges (корінь у 0, діти на +-1/2, онуки ще на +-1/4...),
+# але без рекурсії й без накопичення зсувів
+def heap_positions(size):
+    ranks = np.arange(1, size + 1)
+    # frexp повертає точний двійковий порядок, на відміну від floor(log2)
+    depths = np.frexp(ranks)[1] - 1
+    offsets = ranks - (1 << depths)
+    x = (2 * offsets + 1) / 2.0 ** depths - 1
+    return np.column_stack((x, -depths))
+
+# Відображення купи без об'єктів Node: ідентифікатор вузла - його індекс у
+# масиві, ребра з'єднують i з (i - 1) // 2. Мітки малюються лише для
+# невеликих куп, зображення зберігається у файл без вікна
+def render_heap(heap, filename, colors="skyblue", label_limit=LABEL_LIMIT, node_size=None):
+    size = len(heap)
+    pos = heap_positions(size)
+    show_labels = size <= label_limit
+    if node_size is None:
+        node_size = 2500 if show_labels else 4
+
+    fig = Figure(figsize=(8, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    children = np.arange(1, size)
+    edges = np.stack((pos[(children - 1) // 2], pos[children]), axis=1)
+    ax.add_collection(LineCollection(edges, colors='black', linewidths=1.0 if show_labels else 0.5, zorder=1))
+    ax.scatter(pos[:, 0], pos[:, 1], s=node_size, c=colors, zorder=2, clip_on=False)
+
+    if show_labels:
+        for (x, y), val in zip(pos, heap):
+            ax.text(x, y, str(val), ha='center', va='center', zorder=3)
+
+    ax.margins(0.1)
+    ax.autoscale_view()
+    ax.set_axis_off()
+    fig.savefig(filename, dpi=150)
+    return fig
+
+# Індексована d-арна купа: пріоритети та елементи зберігаються у двох
+# паралельних масивах, а словник positions відображає елемент (дескриптор)
+# на його індекс. Це дає decrease_key, update і remove за O(log n) без
+# дублікатів у купі. Діти вузла i - індекси d*i+1 ... d*i+d, батько - (i-1)//d
+class IndexedHeap:
+    def __init__(self, arity=2, max_heap=False):
+        if arity < 2:
+            raise ValueError("Арність купи має бути не меншою за 2")
+        self.arity = arity
+        self.max_heap = max_heap
+        self._before = operator.gt if max_heap else operator.lt
+        self._select = max if max_heap else min
+        self.items = []
+        self.priorities = []
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def priority(self, item):
+        return self.priorities[self.positions[item]]
+
+    def push(self, item, priority):
+        if item in self.positions:
+            raise ValueError(f"Елемент {item!r} вже є у купі")
+        self.items.append(item)
+        self.priorities.append(priority)
+        self.positions[item] = len(self.items) - 1
+        self._sift_up(len(self.items) - 1)
+
+    def peek(self):
+        if not self.items:
+            raise IndexError("peek з порожньої купи")
+        return self.items[0], self.priorities[0]
+
+    def pop(self):
+        if not self.items:
+            raise IndexError("pop з порожньої купи")
+        top = self.items[0], self.priorities[0]
+        self._remove_at(0)
+        return top
+
+    # Побудова купи з пар (елемент, пріоритет) за O(n) замість n вставок
+    def heapify(self, pairs):
+        self.items, self.priorities = [], []
+        for item, priority in pairs:
+            self.items.append(item)
+            self.priorities.append(priority)
+        self.positions = {item: index for index, item in enumerate(self.items)}
+        if len(self.positions) != len(self.items):
+            raise ValueError("Елементи купи мають бути унікальними")
+
+        for index in reversed(range((len(self.items) - 2) // self.arity + 1)):
+            self._sift_down(index)
+
+    # Покращення пріоритету (менший для min-купи, більший для max-купи)
+    def decrease_key(self, item, priority):
+        index = self.positions[item]
+        if self._before(self.priorities[index], priority):
+            raise ValueError("Новий пріоритет гірший за поточний, використовуйте update")
+        self.priorities[index] = priority
+        self._sift_up(index)
+
+    def update(self, item, priority):
+        index = self.positions[item]
+        old_priority = self.priorities[index]
+        self.priorities[index] = priority
+        if self._before(priority, old_priority):
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def remove(self, item):
+        index = self.positions[item]
+        priority = self.priorities[index]
+        self._remove_at(index)
+        return priority
+
+    def _remove_at(self, index):
+        del self.positions[self.items[index]]
+        last_item = self.items.pop()
+        last_priority = self.priorities.pop()
+        if index == len(self.items):
+            return
+
+        # Останній елемент займає звільнене місце і рухається вгору або вниз
+        self.items[index] = last_item
+        self.priorities[index] = last_priority
+        self.positions[last_item] = index
+        parent = (index - 1) // self.arity
+        if index > 0 and self._before(last_priority, self.priorities[parent]):
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    # Просіювання "діркою": елемент записується один раз у кінцеву позицію
+    def _sift_up(self, index):
+        items, priorities, positions = self.items, self.priorities, self.positions
+        arity, before = self.arity, self._before
+        item, priority = items[index], priorities[index]
+        while index > 0:
+            parent = (index - 1) // arity
+            if not before(priority, priorities[parent]):
+                break
+            items[index] = items[parent]
+            priorities[index] = priorities[parent]
+            positions[items[index]] = index
+            index = parent
+        items[index] = item
+        priorities[index] = priority
+        positions[item] = index
+
+    def _sift_down(self, index):
+        items, priorities, positions = self.items, self.priorities, self.positions
+        arity, before, select = self.arity, self._before, self._select
+        item, priority = items[index], priorities[index]
+        size = len(items)
+        key = priorities.__getitem__
+        while True:
+            first = arity * index + 1
+            if first >= size:
+                break
+            child = select(range(first, min(first + arity, size)), key=key)
+            if not before(priorities[child], priority):
+                break
+            items[index] = items[child]
+            priorities[index] = priorities[child]
+            positions[items[index]] = index
+            index = child
+        items[index] = item
+        priorities[index] = priority
+        positions[item] = index
+
+    # Візуалізація масиву пріоритетів через heap_to_tree/draw_tree або,
+    # якщо вказано файл, через render_heap. Обидва способи розраховані
+    # на бінарну купу
+    def draw(self, filename=None):
+        if self.arity != 2:
+            raise ValueError("Візуалізація підтримує лише бінарну купу (arity=2)")
+        if filename is None:
+            draw_tree(heap_to_tree(self.priorities))
+        else:
+            render_heap(self.priorities, filename)
+
 def main():
     heap = [100, 19, 36, 17, 3, 25, 1, 2, 7]
     heap_root = heap_to_tree(heap)
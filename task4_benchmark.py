@@ -0,0 +1,130 @@
+import heapq
+import math
+import random
+import time
+
+from task3 import deijkstra
+from task3_benchmark import grid_graph
+from task4 import IndexedHeap
+
+HEAP_SIZE = 200_000
+DECREASES = 400_000
+GRID_SIZE = 150
+ARITIES = (2, 4, 8)
+
+
+# Купа heapq з лінивим видаленням: замість decrease_key додається новий
+# запис, а застарілі записи пропускаються під час pop
+class LazyHeap:
+    def __init__(self, pairs):
+        self.current = dict(pairs)
+        self.heap = [(priority, item) for item, priority in self.current.items()]
+        heapq.heapify(self.heap)
+
+    def __len__(self):
+        return len(self.current)
+
+    def decrease_key(self, item, priority):
+        self.current[item] = priority
+        heapq.heappush(self.heap, (priority, item))
+
+    def pop(self):
+        while True:
+            priority, item = heapq.heappop(self.heap)
+            if self.current.get(item) == priority:
+                del self.current[item]
+                return item, priority
+
+
+def indexed_heap(arity):
+    def build(pairs):
+        heap = IndexedHeap(arity)
+        heap.heapify(pairs)
+        return heap
+    return build
+
+
+def heap_factories():
+    factories = {"heapq (лінива)": LazyHeap}
+    for arity in ARITIES:
+        factories[f"IndexedHeap d={arity}"] = indexed_heap(arity)
+    return factories
+
+
+# Навантаження як у Дейкстри: побудова, серія покращень пріоритетів
+# випадкових елементів і вилучення всіх елементів по черзі
+def decrease_key_workload(build, size, decreases, seed=1):
+    rng = random.Random(seed)
+    priorities = {item: rng.random() for item in range(size)}
+    updates = [rng.randrange(size) for _ in range(decreases)]
+
+    start = time.perf_counter()
+    heap = build(priorities.items())
+    for item in updates:
+        priorities[item] *= 0.9
+        heap.decrease_key(item, priorities[item])
+    order = [heap.pop()[1] for _ in range(size)]
+    elapsed = time.perf_counter() - start
+
+    assert order == sorted(order)
+    return elapsed
+
+
+def benchmark_workload(size=HEAP_SIZE, decreases=DECREASES):
+    print(f"{size:,} елементів, {decreases:,} decrease_key, вилучення всіх")
+    print(f"{'Купа':<22}{'Час, с':>10}")
+    print("-" * 32)
+    for name, build in heap_factories().items():
+        print(f"{name:<22}{decrease_key_workload(build, size, decreases):>10.3f}")
+
+
+def indexed_deijkstra(graph, start, arity):
+    distances = {v: float('inf') for v in graph}
+    distances[start] = 0
+    heap = IndexedHeap(arity)
+    heap.push(start, 0)
+    settled = set()
+
+    while heap:
+        u, dist = heap.pop()
+        settled.add(u)
+        for v, weight in graph[u]:
+            new_dist = dist + weight
+            if v not in settled and new_dist < distances[v]:
+                if v in heap:
+                    heap.decrease_key(v, new_dist)
+                else:
+                    heap.push(v, new_dist)
+                distances[v] = new_dist
+
+    return distances
+
+
+def benchmark_deijkstra(size=GRID_SIZE):
+    graph, _ = grid_graph(size)
+    source = next(iter(graph))
+
+    start = time.perf_counter()
+    expected, _ = deijkstra(graph, source)
+    baseline = time.perf_counter() - start
+
+    print(f"Дейкстра на решітці {size}x{size}: {len(graph):,} вершин")
+    print(f"{'Купа':<22}{'Час, с':>10}")
+    print("-" * 32)
+    print(f"{'heapq (лінива)':<22}{baseline:>10.3f}")
+    for arity in ARITIES:
+        start = time.perf_counter()
+        distances = indexed_deijkstra(graph, source, arity)
+        elapsed = time.perf_counter() - start
+        assert all(math.isclose(distances[v], expected[v]) for v in graph)
+        print(f"{f'IndexedHeap d={arity}':<22}{elapsed:>10.3f}")
+
+
+def main():
+    benchmark_workload()
+    print()
+    benchmark_deijkstra()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,19 @@
 import uuid
+from itertools import islice
 
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
 from collections import deque
+from matplotlib.animation import FuncAnimation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.figure import Figure
+from PIL import Image
+
+LABEL_LIMIT = 100
+ANIMATION_MAX_FRAMES = 200
 
 
 class Node:
@@ -70,50 +81,212 @@ def generate_gradient_colors(n, base_color=(18, 150, 240)):
     
     return colors
 
-# Обхід у глибину (DFS) з використанням стеку
-def dfs_traversal(root):
-    if not root:
-        return []
-    
-    visited_order = []
-    stack = [root]
-    
+# Ліниві обходи: генератори повертають вузли по одному, тож обхід можна
+# зупинити на першому збігу, а пам'ять обмежена висотою (стек) або
+# шириною (черга) дерева. Вузлом може бути об'єкт Node або індекс у масиві
+# купи - доступ до дітей задають функції left і right, що повертають None
+# за відсутності дитини
+def _node_left(node):
+    return node.left
+
+def _node_right(node):
+    return node.right
+
+def preorder_traversal(root, left=_node_left, right=_node_right):
+    stack = [root] if root is not None else []
     while stack:
         node = stack.pop()
-        visited_order.append(node)
+        yield node
         
         # Додаємо правий вузол першим, щоб лівий оброблявся раніше
-        if node.right:
-            stack.append(node.right)
-        if node.left:
-            stack.append(node.left)
+        for child in (right(node), left(node)):
+            if child is not None:
+                stack.append(child)
+
+def inorder_traversal(root, left=_node_left, right=_node_right):
+    stack = []
+    node = root
+    while stack or node is not None:
+        # Спускаємося ліворуч, запам'ятовуючи предків
+        while node is not None:
+            stack.append(node)
+            node = left(node)
+        node = stack.pop()
+        yield node
+        node = right(node)
+
+def postorder_traversal(root, left=_node_left, right=_node_right):
+    # Пари (вузол, чи пройдено правий підграф): порівняння вузлів не потрібне,
+    # тож обхід працює і для індексів купи, де однакові числа - різні об'єкти
+    stack = []
+    node = root
+    while stack or node is not None:
+        while node is not None:
+            stack.append((node, False))
+            node = left(node)
+        top, right_done = stack.pop()
+        right_child = right(top)
+        if right_child is not None and not right_done:
+            stack.append((top, True))
+            node = right_child
+        else:
+            yield top
+
+def level_order_traversal(root, left=_node_left, right=_node_right):
+    queue = deque([root] if root is not None else [])
+    while queue:
+        node = queue.popleft()
+        yield node
+        
+        for child in (left(node), right(node)):
+            if child is not None:
+                queue.append(child)
+
+# Рівні дерева по черзі: у пам'яті лише поточний і наступний рівні
+def level_batches(root, left=_node_left, right=_node_right):
+    level = [root] if root is not None else []
+    while level:
+        yield level
+        level = [child for node in level for child in (left(node), right(node)) if child is not None]
+
+# Обходи масиву купи без побудови дерева: вузли - індекси, діти вузла i -
+# 2i+1 і 2i+2. Значення отримуються як heap[i]
+def heap_children(heap):
+    size = len(heap)
     
-    return visited_order
+    def left(i):
+        return 2 * i + 1 if 2 * i + 1 < size else None
+    
+    def right(i):
+        return 2 * i + 2 if 2 * i + 2 < size else None
+    
+    return left, right
+
+def heap_preorder(heap):
+    return preorder_traversal(0 if heap else None, *heap_children(heap))
+
+def heap_inorder(heap):
+    return inorder_traversal(0 if heap else None, *heap_children(heap))
+
+def heap_postorder(heap):
+    return postorder_traversal(0 if heap else None, *heap_children(heap))
+
+# У масиві купи рівні - суцільні діапазони індексів, тож черга не потрібна
+def heap_level_order(heap):
+    return iter(range(len(heap)))
+
+def heap_level_batches(heap):
+    start = 0
+    while start < len(heap):
+        yield range(start, min(2 * start + 1, len(heap)))
+        start = 2 * start + 1
+
+# Обхід у глибину (DFS) з використанням стеку
+def dfs_traversal(root):
+    return list(preorder_traversal(root))
 
 # Обхід у ширину (BFS) з використанням черги
 def bfs_traversal(root):
+    return list(level_order_traversal(root))
+
+# Розташування як у add_edges, але без рекурсії й одразу в масивах:
+# вузли в порядку прямого обходу, їхні координати та відрізки ребер
+def tree_layout(root):
+    nodes, positions, edges = [], [], []
+    stack = [(root, 0.0, 0.0, 1)]
+    while stack:
+        node, x, y, layer = stack.pop()
+        nodes.append(node)
+        positions.append((x, y))
+        for child, direction in ((node.right, 1), (node.left, -1)):
+            if child is not None:
+                child_x = x + direction / 2 ** layer
+                edges.append(((x, y), (child_x, y - 1)))
+                stack.append((child, child_x, y - 1, layer + 1))
+    return nodes, np.array(positions), np.array(edges).reshape(-1, 2, 2)
+
+# Покадровий експорт обходу в GIF або MP4 (через ffmpeg). Дерево малюється
+# один раз, а кожен крок лише домальовує (blit) щойно відвідані вузли поверх
+# уже намальованого - вартість кроку не залежить від розміру дерева. Якщо
+# вузлів більше за max_frames, кадр фарбує кілька вузлів одразу.
+# GIF пишеться прямо з буфера полотна: PillowWriter перемальовував би всю
+# фігуру для кожного кадру
+def animate_traversal(root, traversal_func, filename, title="Tree Traversal", fps=10, dpi=80,
+                      max_frames=ANIMATION_MAX_FRAMES):
     if not root:
-        return []
+        return
     
-    visited_order = []
-    queue = deque([root])
+    nodes, pos, edges = tree_layout(root)
+    index = {node.id: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+    colors = to_rgba_array(generate_gradient_colors(n))
+    show_labels = n <= LABEL_LIMIT
+    node_size = 2500 if show_labels else 20
     
-    while queue:
-        node = queue.popleft()
-        visited_order.append(node)
-        
-        if node.left:
-            queue.append(node.left)
-        if node.right:
-            queue.append(node.right)
+    fig = Figure(figsize=(10, 6), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.add_collection(LineCollection(edges, colors='black', linewidths=1.0 if show_labels else 0.5, zorder=1))
+    ax.scatter(pos[:, 0], pos[:, 1], s=node_size, c='skyblue', zorder=2, clip_on=False)
+    labels = []
+    if show_labels:
+        labels = [ax.text(x, y, str(node.val), ha='center', va='center', fontsize=10, fontweight='bold', zorder=3)
+                  for node, (x, y) in zip(nodes, pos)]
+    ax.margins(0.1)
+    ax.autoscale_view()
+    ax.set_axis_off()
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    canvas.draw()
+    visited = ax.scatter(pos[:1, 0], pos[:1, 1], s=node_size, zorder=2, clip_on=False, animated=True)
+    
+    step = -(-n // max_frames)
+    frame_count = -(-n // step)
+    
+    # Кадр - той самий буфер полотна, оновлений на місці
+    def frames():
+        order = iter(traversal_func(root))
+        start = 0
+        while True:
+            batch = [index[node.id] for node in islice(order, step)]
+            if not batch:
+                return
+            visited.set_offsets(pos[batch])
+            visited.set_facecolor(colors[start:start + len(batch)])
+            ax.draw_artist(visited)
+            for i in batch if labels else ():
+                ax.draw_artist(labels[i])
+            start += len(batch)
+            yield np.asarray(canvas.buffer_rgba())
+    
+    if filename.lower().endswith('.gif'):
+        images = (Image.fromarray(frame).convert('RGB').quantize(method=Image.Quantize.FASTOCTREE)
+                  for frame in frames())
+        first = next(images)
+        first.save(filename, save_all=True, append_images=images, duration=int(1000 / fps), loop=0)
+        return
     
-    return visited_order
+    movie = Figure(figsize=fig.get_size_inches(), dpi=dpi)
+    FigureCanvasAgg(movie)
+    image = movie.figimage(np.asarray(canvas.buffer_rgba()))
+    
+    def update(frame):
+        image.set_data(frame)
+        return (image,)
+    
+    animation = FuncAnimation(movie, update, frames=frames(), init_func=lambda: (image,),
+                              save_count=frame_count, cache_frame_data=False)
+    animation.save(filename, writer='ffmpeg', fps=fps, dpi=dpi)
 
-# Візуалізація обходу дерева з градієнтом кольорів
-def visualize_traversal(root, traversal_func, title="Tree Traversal"):
+# Візуалізація обходу дерева з градієнтом кольорів. З animation_file
+# замість вікна зберігається анімація обходу крок за кроком
+def visualize_traversal(root, traversal_func, title="Tree Traversal", animation_file=None):
     if not root:
         return
     
+    if animation_file is not None:
+        animate_traversal(root, traversal_func, animation_file, title)
+        return
+    
     # Отримуємо порядок обходу
     visited_order = traversal_func(root)
     n = len(visited_order)
@@ -164,19 +337,25 @@ def visualize_traversal(root, traversal_func, title="Tree Traversal"):
     plt.subplots_adjust(bottom=0.15)
     plt.show()
 
-def visualize_dfs(root):
-    visualize_traversal(root, dfs_traversal, "Обхід у глибину (DFS) - використано стек")
+def visualize_dfs(root, animation_file=None):
+    visualize_traversal(root, dfs_traversal, "Обхід у глибину (DFS) - використано стек", animation_file)
 
 
-def visualize_bfs(root):
-    visualize_traversal(root, bfs_traversal, "Обхід у ширину (BFS) - використано чергу")
+def visualize_bfs(root, animation_file=None):
+    visualize_traversal(root, bfs_traversal, "Обхід у ширину (BFS) - використано чергу", animation_file)
 
 
 def main():
     heap = [100, 19, 36, 17, 3, 25, 1, 2, 7]
     heap_root = heap_to_tree(heap)
     
-    print("Оригінальне дерево:")
+    print("Обходи масиву купи без побудови дерева:")
+    for name, traversal in (("preorder", heap_preorder), ("inorder", heap_inorder),
+                            ("postorder", heap_postorder), ("level-order", heap_level_order)):
+        print(f"{name}: {[heap[i] for i in traversal(heap)]}")
+    print(f"рівні: {[[heap[i] for i in level] for level in heap_level_batches(heap)]}")
+    
+    print("\nОригінальне дерево:")
     draw_tree(heap_root)
     
     print("\nВізуалізація DFS:")
@@ -0,0 +1,83 @@
+import time
+from itertools import islice
+
+from task5 import (
+    heap_inorder,
+    heap_level_order,
+    heap_postorder,
+    heap_preorder,
+    heap_to_tree,
+    inorder_traversal,
+    level_order_traversal,
+    postorder_traversal,
+    preorder_traversal,
+)
+
+CHECK_SIZE = 600
+HEAP_SIZE = 1_000_000
+TRAVERSALS = {
+    "preorder": (heap_preorder, preorder_traversal),
+    "inorder": (heap_inorder, inorder_traversal),
+    "postorder": (heap_postorder, postorder_traversal),
+    "level-order": (heap_level_order, level_order_traversal),
+}
+
+
+def recursive_traversal(node, order, out):
+    if node is None:
+        return out
+    if order == "preorder":
+        out.append(node.val)
+    recursive_traversal(node.left, order, out)
+    if order == "inorder":
+        out.append(node.val)
+    recursive_traversal(node.right, order, out)
+    if order == "postorder":
+        out.append(node.val)
+    return out
+
+
+# Перевірка обходів масиву купи проти рекурсивних обходів дерева Node.
+# Розмір понад 256 важливий: більші цілі числа - різні об'єкти, тож обхід
+# не може покладатися на порівняння вузлів через is
+def check_heap_traversals(size=CHECK_SIZE):
+    heap = list(range(size))
+    root = heap_to_tree(heap)
+    for order in ("preorder", "inorder", "postorder"):
+        traversal = TRAVERSALS[order][0]
+        assert list(islice(traversal(heap), size + 1)) == recursive_traversal(root, order, []), order
+    print(f"Перевірка: обходи купи з {size} елементів збігаються з рекурсивними")
+
+
+# Обходи за індексами масиву проти обходів дерева Node, побудованого з того ж
+# масиву. Час побудови дерева показано окремо: обходам купи він не потрібен
+def benchmark_traversals(size=HEAP_SIZE):
+    heap = list(range(size))
+    start = time.perf_counter()
+    root = heap_to_tree(heap)
+    build = time.perf_counter() - start
+
+    print(f"Купа з {size:,} елементів, побудова дерева Node: {build:.3f} с")
+    print(f"{'Обхід':<14}{'Масив, с':>12}{'Дерево, с':>12}")
+    print("-" * 38)
+    for name, (heap_traversal, tree_traversal) in TRAVERSALS.items():
+        start = time.perf_counter()
+        count = sum(1 for _ in heap_traversal(heap))
+        array_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tree_count = sum(1 for _ in tree_traversal(root))
+        tree_time = time.perf_counter() - start
+
+        assert count == tree_count == size
+        print(f"{name:<14}{array_time:>12.3f}{tree_time:>12.3f}")
+
+
+def main():
+    check_heap_traversals()
+    print()
+    benchmark_traversals()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
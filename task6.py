@@ -1,3 +1,19 @@
+import time
+from bisect import bisect_right
+from math import gcd
+
+import numpy as np
+
+# Найбільший обсяг пам'яті (байт), за якого використовується щільна DP
+DENSE_DP_MEMORY_LIMIT = 2 ** 30
+# Пам'ять щільної DP на стовпець таблиці поза матрицею вибору (1 біт на
+# клітинку): рядок DP int64, тимчасові масиви кандидатів і маски на кожному кроці
+BUDGET_DP_BYTES_PER_COLUMN = 18
+VALUE_DP_BYTES_PER_COLUMN = 27
+# Найбільший розмір фронту Парето, після якого solve_knapsack переходить до DP
+PARETO_STATE_LIMIT = 200_000
+
+
 def greedy_algorithm(items, budget):
     sorted_items = sorted(
         items.items(),
@@ -46,6 +62,256 @@ def dynamic_programming(items, budget):
     
     return selected
 
+# Векторизований варіант: замість таблиці (n+1) x (budget+1) - один рядок
+# NumPy, що оновлюється зсувом на вартість предмета. Для відновлення
+# розв'язку зберігається лише бітова матриця "предмет узято" (1 біт на клітинку).
+# Результат збігається з dynamic_programming
+def dynamic_programming_vectorized(items, budget):
+    names = list(items.keys())
+    costs = [items[name]["cost"] for name in names]
+    calories = [items[name]["calories"] for name in names]
+    
+    dtype = np.result_type(*calories) if calories else np.int64
+    dp_row = np.zeros(budget + 1, dtype=dtype)
+    keep_bits = []
+    
+    for cost, calorie in zip(costs, calories):
+        keep = np.zeros(budget + 1, dtype=bool)
+        if cost <= budget:
+            candidate = dp_row[:budget + 1 - cost] + calorie
+            keep[cost:] = candidate > dp_row[cost:]
+            np.maximum(dp_row[cost:], candidate, out=dp_row[cost:])
+        keep_bits.append(np.packbits(keep))
+    
+    selected = []
+    remaining_budget = budget
+    for item_index in range(len(names) - 1, -1, -1):
+        byte = keep_bits[item_index][remaining_budget >> 3]
+        if (byte >> (7 - (remaining_budget & 7))) & 1:
+            selected.append(names[item_index])
+            remaining_budget -= costs[item_index]
+    
+    return selected
+
+# Попередня обробка перед DP, що зменшує простір станів без зміни оптимуму:
+# 1) відкидаються предмети, дорожчі за бюджет;
+# 2) вартості й бюджет діляться на їхній НСД;
+# 3) відкидаються домінуючі предмети: є дешевші (або такі самі) предмети
+#    з не меншою калорійністю. У задачі 0/1 це безпечно, лише якщо предмет
+#    разом з усіма, що його домінують, не вміщується в бюджет: тоді
+#    в будь-якому розв'язку знайдеться вільний кращий предмет для заміни;
+# 4) бюджет обмежується сумарною вартістю предметів.
+# Повертає (зменшені предмети зі зміненими вартостями, новий бюджет)
+def preprocess_items(items, budget):
+    candidates = {name: data for name, data in items.items() if data["cost"] <= budget}
+    
+    divisor = 0
+    for data in candidates.values():
+        divisor = gcd(divisor, data["cost"])
+    divisor = divisor or 1
+    scaled_budget = budget // divisor
+    
+    names = list(candidates)
+    costs = [candidates[name]["cost"] // divisor for name in names]
+    calories = [candidates[name]["calories"] for name in names]
+    order = sorted(range(len(names)), key=lambda i: (costs[i], -calories[i], i))
+    
+    # Дерево Фенвіка за рангом калорійності (від більшої до меншої):
+    # сума вартостей уже переглянутих предметів з калорійністю не меншою за задану
+    calorie_rank = {c: r for r, c in enumerate(sorted(set(calories), reverse=True), start=1)}
+    tree = [0] * (len(calorie_rank) + 1)
+    dominated = set()
+    
+    for i in order:
+        position = calorie_rank[calories[i]]
+        dominators_cost = 0
+        while position > 0:
+            dominators_cost += tree[position]
+            position -= position & -position
+        if costs[i] + dominators_cost > scaled_budget:
+            dominated.add(names[i])
+        
+        position = calorie_rank[calories[i]]
+        while position < len(tree):
+            tree[position] += costs[i]
+            position += position & -position
+    
+    reduced = {
+        name: {**candidates[name], "cost": cost}
+        for name, cost in zip(names, costs) if name not in dominated
+    }
+    total_cost = sum(data["cost"] for data in reduced.values())
+    return reduced, min(scaled_budget, total_cost)
+
+
+def dynamic_programming_pruned(items, budget):
+    reduced, reduced_budget = preprocess_items(items, budget)
+    return dynamic_programming_vectorized(reduced, reduced_budget)
+
+# Розріджена DP за фронтом Парето: зберігаються лише недоміновані стани
+# (вартість, калорії), тож обсяг роботи не залежить від величини бюджету.
+# Фронт відсортований за вартістю, калорії в ньому строго зростають.
+# З max_states повертає None, щойно фронт перевищить цей розмір
+def pareto_knapsack(items, budget, max_states=None):
+    names = list(items.keys())
+    frontier = [(0, 0, None)]  # (вартість, калорії, (індекс предмета, попередній стан))
+    
+    for item_index, name in enumerate(names):
+        cost, calories = items[name]["cost"], items[name]["calories"]
+        shifted = [
+            (state_cost + cost, state_calories + calories, (item_index, state))
+            for state_cost, state_calories, state in frontier
+            if state_cost + cost <= budget
+        ]
+        frontier = _merge_frontiers(frontier, shifted)
+        if max_states is not None and len(frontier) > max_states:
+            return None
+    
+    selected = []
+    state = frontier[-1][2]
+    while state is not None:
+        item_index, state = state
+        selected.append(names[item_index])
+    return selected
+
+
+def _merge_frontiers(first, second):
+    merged = []
+    i = j = 0
+    while i < len(first) or j < len(second):
+        if j == len(second) or (i < len(first) and (first[i][0], -first[i][1]) <= (second[j][0], -second[j][1])):
+            candidate = first[i]
+            i += 1
+        else:
+            candidate = second[j]
+            j += 1
+        if not merged or candidate[1] > merged[-1][1]:
+            merged.append(candidate)
+    return merged
+
+
+# DP за калоріями: min_cost[v] - найменша вартість набору з рівно v калорій.
+# Розмір таблиці залежить від сумарних калорій, а не від бюджету,
+# тож підходить для величезних бюджетів і цілих калорій
+def value_indexed_dp(items, budget):
+    names = list(items.keys())
+    costs = [items[name]["cost"] for name in names]
+    calories = [items[name]["calories"] for name in names]
+    total_calories = sum(calories)
+    
+    min_cost = np.full(total_calories + 1, np.iinfo(np.int64).max, dtype=np.int64)
+    min_cost[0] = 0
+    keep_bits = []
+    
+    for cost, calorie in zip(costs, calories):
+        keep = np.zeros(total_calories + 1, dtype=bool)
+        reachable = min_cost[:total_calories + 1 - calorie]
+        candidate = np.where(reachable <= budget - cost, reachable + cost, np.iinfo(np.int64).max)
+        keep[calorie:] = candidate < min_cost[calorie:]
+        np.minimum(min_cost[calorie:], candidate, out=min_cost[calorie:])
+        keep_bits.append(np.packbits(keep))
+    
+    remaining_calories = int(np.flatnonzero(min_cost <= budget)[-1])
+    selected = []
+    for item_index in range(len(names) - 1, -1, -1):
+        byte = keep_bits[item_index][remaining_calories >> 3]
+        if (byte >> (7 - (remaining_calories & 7))) & 1:
+            selected.append(names[item_index])
+            remaining_calories -= calories[item_index]
+    
+    return selected
+
+
+# Автоматичний вибір розв'язувача за формою задачі після попередньої обробки.
+# Спершу фронт Парето: на реальних даних він зазвичай малий навіть за
+# величезного бюджету. Якщо фронт стає ширшим за щільну таблицю (або за
+# PARETO_STATE_LIMIT), далі працює щільна DP за бюджетом або за калоріями -
+# з меншою таблицею серед тих, що вміщуються в DENSE_DP_MEMORY_LIMIT,
+# а якщо жодна не вміщується - метод гілок і меж з пам'яттю O(n)
+def solve_knapsack(items, budget):
+    reduced, reduced_budget = preprocess_items(items, budget)
+    item_count = len(reduced)
+    
+    widths = {dynamic_programming_vectorized: (reduced_budget + 1, BUDGET_DP_BYTES_PER_COLUMN)}
+    calories = [data["calories"] for data in reduced.values()]
+    if all(isinstance(c, int) and c >= 0 for c in calories):
+        widths[value_indexed_dp] = (sum(calories) + 1, VALUE_DP_BYTES_PER_COLUMN)
+    
+    state_limit = min(PARETO_STATE_LIMIT, min(width for width, _ in widths.values()))
+    selected = pareto_knapsack(reduced, reduced_budget, max_states=state_limit)
+    if selected is not None:
+        return selected
+    
+    dense = [
+        (item_count * width, solver)
+        for solver, (width, bytes_per_column) in widths.items()
+        if item_count * width / 8 + bytes_per_column * width <= DENSE_DP_MEMORY_LIMIT
+    ]
+    if not dense:
+        return branch_and_bound(reduced, reduced_budget)[0]
+    _, solver = min(dense, key=lambda entry: entry[0])
+    return solver(reduced, reduced_budget)
+
+# Метод гілок і меж: предмети впорядковуються за калоріями на одиницю
+# вартості, як у жадібному алгоритмі, а його результат є початковою нижньою
+# межею. Гілка відсікається, якщо дробова релаксація (заповнення залишку
+# бюджету частиною наступного предмета) не краща за знайдений розв'язок.
+# З time_limit (секунди) повертає найкращий знайдений розв'язок і відносний
+# розрив до верхньої межі; розрив 0 означає доведену оптимальність
+def branch_and_bound(items, budget, time_limit=None):
+    free = [name for name, data in items.items() if data["cost"] == 0 and data["calories"] > 0]
+    paid = {name: data for name, data in items.items() if 0 < data["cost"] <= budget}
+    
+    names = sorted(paid, key=lambda name: paid[name]["calories"] / paid[name]["cost"], reverse=True)
+    costs = [paid[name]["cost"] for name in names]
+    calories = [paid[name]["calories"] for name in names]
+    item_count = len(names)
+    prefix_costs, prefix_calories = [0], [0]
+    for cost, calorie in zip(costs, calories):
+        prefix_costs.append(prefix_costs[-1] + cost)
+        prefix_calories.append(prefix_calories[-1] + calorie)
+    
+    def upper_bound(index, cost, value):
+        capacity = budget - cost
+        last = bisect_right(prefix_costs, prefix_costs[index] + capacity) - 1
+        bound = value + prefix_calories[last] - prefix_calories[index]
+        if last < item_count:
+            bound += (capacity - prefix_costs[last] + prefix_costs[index]) * calories[last] / costs[last]
+        return bound
+    
+    best_selected = greedy_algorithm(paid, budget)
+    best_value = sum(paid[name]["calories"] for name in best_selected)
+    best_chosen = None
+    
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    stack = [(0, 0, 0, None)]  # (індекс предмета, вартість, калорії, (індекс, попередній вибір))
+    nodes = 0
+    
+    while stack:
+        nodes += 1
+        if deadline is not None and nodes % 1024 == 0 and time.perf_counter() > deadline:
+            break
+        index, cost, value, chosen = stack.pop()
+        if value > best_value:
+            best_value, best_chosen = value, chosen
+        if index == item_count or upper_bound(index, cost, value) <= best_value:
+            continue
+        
+        # Гілку "взяти" кладемо останньою, щоб вона розглядалася першою
+        stack.append((index + 1, cost, value, chosen))
+        if cost + costs[index] <= budget:
+            stack.append((index + 1, cost + costs[index], value + calories[index], (index, chosen)))
+    
+    if best_chosen is not None:
+        best_selected = []
+        while best_chosen is not None:
+            index, best_chosen = best_chosen
+            best_selected.append(names[index])
+    
+    upper = max([best_value] + [upper_bound(index, cost, value) for index, cost, value, _ in stack])
+    gap = (upper - best_value) / upper if upper > 0 else 0.0
+    return best_selected + free, gap
+
 def main():
     items = {
         "pizza": {"cost": 50, "calories": 300},
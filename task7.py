@@ -1,57 +1,348 @@
+import argparse
+import os
 import random
-import matplotlib.pyplot as plt
-import pandas as pd
+import numpy as np
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
+# pandas, matplotlib та scipy імпортуються всередині функцій, яким вони
+# потрібні: запуск лише симуляції не витрачає час на їхнє завантаження
 
-def analytical_probabilities():
-    combinations = {
-        2: 1,
-        3: 2,
-        4: 3,
-        5: 4,
-        6: 5,
-        7: 6,
-        8: 5,
-        9: 4, 
-        10: 3,
-        11: 2,
-        12: 1
-    }
+CHUNK_SIZE = 1_000_000
+CACHE_DIR = '.monte_carlo_cache'
+FFT_CONVOLVE_THRESHOLD = 10_000
+# Пара кубиків кодується одним числом 0..35: (a - 1) * 6 + (b - 1).
+# Таблиця переводить код пари у суму, тож на кидок потрібне одне випадкове число
+PAIR_SUMS = np.add.outer(np.arange(1, 7), np.arange(1, 7)).ravel()
+# Індикатори сум 2..12 для кожного коду пари та для антитетичної пари
+SUM_INDICATORS = (PAIR_SUMS == np.arange(2, 13)[:, None]).astype(np.float64)
+ANTITHETIC_INDICATORS = (14 - PAIR_SUMS == np.arange(2, 13)[:, None]).astype(np.float64)
+IMPORTANCE_PROPOSAL = [3, 1, 1, 1, 1, 3]
+
+
+# Точний розподіл суми num_dice кубиків з faces гранями як ітерована
+# згортка розподілу одного кубика. weights[i] - вага грані i + 1
+def analytical_probabilities(num_dice: int = 2, faces: int = 6, weights=None):
+    if weights is None and faces ** num_dice < 2 ** 53:
+        # Цілі кількості комбінацій, тож імовірності точно дорівнюють c / total
+        die = np.ones(faces, dtype=np.int64)
+        total = faces ** num_dice
+    else:
+        die = np.full(faces, 1 / faces) if weights is None else _normalize(weights)
+        total = 1
     
-    total = 36
+    combinations = np.ones(1, dtype=die.dtype)
+    for _ in range(num_dice):
+        combinations = _convolve(combinations, die)
+
+    return {s: c / total for s, c in enumerate(combinations.tolist(), start=num_dice)}
+
+
+def _normalize(weights):
+    weights = np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum()
 
-    return {s: c / total for s, c in combinations.items()}
 
+# Для довгих дійсних масивів згортка через FFT: O(n log n) замість O(n^2)
+def _convolve(a, b):
+    if a.dtype.kind == 'f' and len(a) * len(b) > FFT_CONVOLVE_THRESHOLD:
+        from scipy.signal import fftconvolve
+        return np.clip(fftconvolve(a, b), 0, None)
+    return np.convolve(a, b)
 
-def monte_carlo_simulation(num_rolls: int = 1_000_000):
-    sums = [random.randint(1, 6) + random.randint(1, 6) for _ in range(num_rolls)]
+
+def monte_carlo_simulation(num_rolls: int = 1_000_000, seed=None, engine: str = "python"):
+    return counts_to_probabilities(simulate_counts(num_rolls, seed, engine), num_rolls)
+
+
+# Сирі лічильники сум (індекс - сума) для обраного рушія симуляції
+def simulate_counts(num_rolls: int, seed=None, engine: str = "python"):
+    if engine == "numpy":
+        return roll_counts(num_rolls, np.random.default_rng(seed))
+    
+    rng = random.Random(seed)
+    sums = [rng.randint(1, 6) + rng.randint(1, 6) for _ in range(num_rolls)]
     counts = Counter(sums)
-    probabilities = {s: counts[s] / num_rolls for s in range(2, 13)}
+    return np.array([counts[s] for s in range(13)], dtype=np.int64)
+
+
+def counts_to_probabilities(counts, num_rolls: int):
+    return {s: int(counts[s]) / num_rolls for s in range(2, 13)}
+
+
+# Лічильники з кешу на диску за ключем (num_rolls, seed, engine).
+# Без seed результат невідтворюваний, тому він не кешується
+def cached_counts(num_rolls: int, seed=None, engine: str = "numpy", cache_dir: str = CACHE_DIR):
+    if seed is None:
+        return simulate_counts(num_rolls, seed, engine)
+    
+    path = os.path.join(cache_dir, f"counts_{engine}_{num_rolls}_{seed}.npz")
+    if os.path.exists(path):
+        with np.load(path) as data:
+            return data['counts']
+    
+    counts = simulate_counts(num_rolls, seed, engine)
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez(path, counts=counts)
+    return counts
+
+
+# Векторизована симуляція: кидки генеруються блоками по chunk_size,
+# тож пам'ять не залежить від num_rolls. Повертає масив із 13 лічильників,
+# де індекс - сума на кубиках
+def roll_counts(num_rolls: int, rng: np.random.Generator, chunk_size: int = CHUNK_SIZE):
+    counts = pair_counts(num_rolls, rng, chunk_size)
+    return np.bincount(PAIR_SUMS, weights=counts, minlength=13).astype(np.int64)
+
+
+# Лічильники кодів пар кубиків; p - необов'язковий розподіл на 36 кодах
+def pair_counts(num_rolls: int, rng: np.random.Generator, chunk_size: int = CHUNK_SIZE, p=None):
+    counts = np.zeros(36, dtype=np.int64)
+    remaining = num_rolls
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        if p is None:
+            pairs = rng.integers(0, 36, size=size, dtype=np.uint8)
+        else:
+            pairs = rng.choice(36, size=size, p=p).astype(np.uint8)
+        counts += np.bincount(pairs, minlength=36)
+        remaining -= size
+    return counts
+
+
+# Оцінювачі зі зменшенням дисперсії. Кожен повертає (імовірності, дисперсії
+# оцінок, ефективний розмір вибірки) - три словники за сумами 2..12.
+# Ефективний розмір - скільки звичайних кидків дали б таку саму дисперсію
+def _estimate(values, counts):
+    n = counts.sum()
+    frequencies = counts / n
+    mean = values @ frequencies
+    variance = (values ** 2 @ frequencies - mean ** 2) / n
+    return mean, np.maximum(variance, 0)
+
+
+def _estimator_result(mean, variance, num_rolls):
+    sums = range(2, 13)
+    exact_zero = variance == 0
+    ess = np.where(exact_zero, num_rolls, mean * (1 - mean) / np.where(exact_zero, 1, variance))
+    return (
+        {s: float(m) for s, m in zip(sums, mean)},
+        {s: float(v) for s, v in zip(sums, variance)},
+        {s: float(e) for s, e in zip(sums, ess)},
+    )
+
+
+def plain_estimator(num_rolls: int, rng: np.random.Generator):
+    mean, variance = _estimate(SUM_INDICATORS, pair_counts(num_rolls, rng))
+    return _estimator_result(mean, variance, num_rolls)
+
+
+# Стратифікація за першим кубиком: по num_rolls / 6 кидків другого кубика
+# для кожного значення першого. Кожна страта кидається частинами по
+# chunk_size, як і в pair_counts
+def stratified_estimator(num_rolls: int, rng: np.random.Generator, chunk_size: int = CHUNK_SIZE):
+    per_stratum = num_rolls // 6
+    if per_stratum == 0:
+        raise ValueError("Стратифікація потребує щонайменше 6 кидків (по одному на страту)")
+    mean = np.zeros(11)
+    variance = np.zeros(11)
+    for first in range(1, 7):
+        second = np.zeros(6, dtype=np.int64)
+        remaining = per_stratum
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            second += np.bincount(rng.integers(0, 6, size=size, dtype=np.uint8), minlength=6)
+            remaining -= size
+        conditional = np.zeros(11)
+        conditional[first - 1:first + 5] = second / per_stratum
+        mean += conditional / 6
+        variance += conditional * (1 - conditional) / per_stratum / 36
+    return _estimator_result(mean, variance, per_stratum * 6)
+
+
+# Антитетичні пари: кидок (a, b) доповнюється кидком (7 - a, 7 - b)
+# із сумою 14 - s, результат пари - середнє двох індикаторів
+def antithetic_estimator(num_rolls: int, rng: np.random.Generator):
+    if num_rolls < 2:
+        raise ValueError("Антитетичні пари потребують щонайменше 2 кидків")
+    values = (SUM_INDICATORS + ANTITHETIC_INDICATORS) / 2
+    mean, variance = _estimate(values, pair_counts(num_rolls // 2, rng))
+    return _estimator_result(mean, variance, num_rolls // 2 * 2)
+
+
+# Вибірка за значущістю: грані кидаються з розподілом proposal, що частіше
+# дає 1 та 6 (а отже рідкісні суми 2 і 12), кожен кидок зважується
+# відношенням справжньої ймовірності пари до ймовірності за proposal
+def importance_estimator(num_rolls: int, rng: np.random.Generator, proposal=IMPORTANCE_PROPOSAL):
+    die = _normalize(proposal)
+    pair_probabilities = np.outer(die, die).ravel()
+    weights = (1 / 36) / pair_probabilities
+    mean, variance = _estimate(SUM_INDICATORS * weights, pair_counts(num_rolls, rng, p=pair_probabilities))
+    return _estimator_result(mean, variance, num_rolls)
+
+
+ESTIMATORS = {
+    "plain": plain_estimator,
+    "stratified": stratified_estimator,
+    "antithetic": antithetic_estimator,
+    "importance": importance_estimator,
+}
+
+
+def estimate_probabilities(num_rolls: int, estimator: str = "plain", seed=None):
+    return ESTIMATORS[estimator](num_rolls, np.random.default_rng(seed))
+
+
+# Узагальнена симуляція: num_dice кубиків з faces гранями, можливо зважених.
+# Кидки діляться між workers процесами, кожен має незалежний потік
+# випадкових чисел із SeedSequence.spawn, гістограми потім сумуються.
+# Повертає масив лічильників, де індекс - сума
+def simulate_dice_counts(num_rolls: int, num_dice: int = 2, faces: int = 6, weights=None,
+                         seed=None, workers=None, chunk_size: int = CHUNK_SIZE):
+    workers = workers or os.cpu_count()
+    weights = None if weights is None else _normalize(weights)
+    shards = [num_rolls // workers + (1 if i < num_rolls % workers else 0) for i in range(workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    
+    if workers == 1:
+        return _simulate_shard(shards[0], num_dice, faces, weights, seeds[0], chunk_size)
     
-    return probabilities
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_simulate_shard, shard, num_dice, faces, weights, shard_seed, chunk_size)
+            for shard, shard_seed in zip(shards, seeds)
+        ]
+        return sum(future.result() for future in futures)
+
 
+def _simulate_shard(num_rolls, num_dice, faces, weights, seed_sequence, chunk_size):
+    rng = np.random.default_rng(seed_sequence)
+    counts = np.zeros(num_dice * faces + 1, dtype=np.int64)
+    dtype = np.int16 if num_dice * faces < 2 ** 15 else np.int64
+    rows_per_chunk = max(1, chunk_size // num_dice)
+    remaining = num_rolls
+    
+    while remaining > 0:
+        rows = min(rows_per_chunk, remaining)
+        if weights is None:
+            rolled = rng.integers(1, faces + 1, size=(rows, num_dice), dtype=dtype)
+        else:
+            rolled = rng.choice(np.arange(1, faces + 1, dtype=dtype), size=(rows, num_dice), p=weights)
+        counts += np.bincount(rolled.sum(axis=1), minlength=len(counts))
+        remaining -= rows
+    
+    return counts
 
-def create_comparison_table(analytical, monte_carlo):
+
+def monte_carlo_dice(num_rolls: int, num_dice: int = 2, faces: int = 6, weights=None, seed=None, workers=None):
+    counts = simulate_dice_counts(num_rolls, num_dice, faces, weights, seed, workers)
+    return {s: int(counts[s]) / num_rolls for s in range(num_dice, num_dice * faces + 1)}
+
+
+# Імовірність довільної події над сумою, наприклад lambda s: s % 2 == 0
+def event_probability(probabilities: dict, predicate):
+    return sum(p for s, p in probabilities.items() if predicate(s))
+
+
+# Адаптивний режим: кидки додаються пакетами по batch_size, доки півширина
+# довірчого інтервалу для кожної суми не стане меншою за tolerance.
+# Повертає (імовірності, кількість кидків)
+def adaptive_monte_carlo(tolerance: float = 0.001, confidence: float = 0.95, batch_size: int = 100_000,
+                         max_rolls: int = 1_000_000_000, seed=None):
+    from scipy.stats import norm
+    
+    z = norm.ppf(0.5 + confidence / 2)
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(13, dtype=np.int64)
+    total = 0
+    
+    while total < max_rolls:
+        size = min(batch_size, max_rolls - total)
+        counts += roll_counts(size, rng)
+        total += size
+        
+        # Та сама напівширина Вілсона, що й у confidence_intervals
+        _, half_width = _wilson(counts[2:] / total, total, z)
+        if np.all(half_width <= tolerance):
+            break
+    
+    return {s: int(counts[s]) / total for s in range(2, 13)}, total
+
+
+# Довірчі інтервали Вілсона для кожної оцінки: {сума: (нижня, верхня межа)}
+def confidence_intervals(monte_carlo: dict, num_rolls: int, confidence: float = 0.95):
+    from scipy.stats import norm
+    
+    z = norm.ppf(0.5 + confidence / 2)
+    intervals = {}
+    for s, p in monte_carlo.items():
+        center, half_width = _wilson(p, num_rolls, z)
+        intervals[s] = (float(center - half_width), float(center + half_width))
+    return intervals
+
+
+# Центр і напівширина інтервалу Вілсона для частки p з n спостережень
+def _wilson(p, n, z):
+    denominator = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return center, half_width
+
+
+# Критерій хі-квадрат узгодженості з аналітичним розподілом: (статистика, p-value)
+def chi_square_test(analytical: dict, monte_carlo: dict, num_rolls: int):
+    from scipy.stats import chisquare
+    
+    observed = np.array([monte_carlo[s] * num_rolls for s in analytical])
+    expected = np.array([analytical[s] for s in analytical]) * observed.sum()
+    statistic, p_value = chisquare(observed, expected)
+    return float(statistic), float(p_value)
+
+
+def create_comparison_table(analytical, monte_carlo, intervals=None):
+    import pandas as pd
+    
     data = []
-    for s in range(2, 13):
+    for s in analytical:
         analytical_prob = analytical[s]
         mc_prob = monte_carlo[s]
         difference = abs(analytical_prob - mc_prob)
         relative_error = (difference / analytical_prob) * 100
         
-        data.append({
+        row = {
             'Сума': s,
-            'Аналітична ймовірність': f"{analytical_prob:.4f} ({analytical_prob*100:.2f}%)",
-            'Монте-Карло': f"{mc_prob:.4f} ({mc_prob*100:.2f}%)",
-            'Абсолютна похибка': f"{difference:.6f}",
-            'Відносна похибка (%)': f"{relative_error:.2f}%"
-        })
+            'Аналітична ймовірність': analytical_prob,
+            'Монте-Карло': mc_prob,
+            'Абсолютна похибка': difference,
+            'Відносна похибка (%)': relative_error
+        }
+        if intervals is not None:
+            row['Нижня межа'], row['Верхня межа'] = intervals[s]
+        data.append(row)
     
     return pd.DataFrame(data)
 
 
+# Форматування числової таблиці лише для виводу в консоль
+def format_comparison_table(df):
+    formatters = {
+        'Аналітична ймовірність': _format_percent,
+        'Монте-Карло': _format_percent,
+        'Абсолютна похибка': lambda d: f"{d:.6f}",
+        'Відносна похибка (%)': lambda r: f"{r:.2f}%",
+        'Нижня межа': lambda p: f"{p:.4f}",
+        'Верхня межа': lambda p: f"{p:.4f}",
+    }
+    return df.to_string(index=False, formatters={k: f for k, f in formatters.items() if k in df})
+
+
+def _format_percent(p):
+    return f"{p:.4f} ({p*100:.2f}%)"
+
+
 def plot_comparison(analytical: dict, monte_carlo: dict, num_rolls: int):
+    import matplotlib.pyplot as plt
+    
     sums = list(range(2, 13))
     analytical_probs = [analytical[s] * 100 for s in sums]
     mc_probs = [monte_carlo[s] * 100 for s in sums]
@@ -99,35 +390,68 @@ def plot_comparison(analytical: dict, monte_carlo: dict, num_rolls: int):
     plt.close()
 
 
-def plot_convergence(max_rolls: int = 100_000, step: int = 1000):
+# Потокова оцінка збіжності: на кожній контрольній точці до гістограми
+# додаються лише нові кидки, тож пам'ять стала за будь-якого max_rolls.
+# Точки розташовані логарифмічно від step до max_rolls.
+# Повертає пари (кількість кидків, середня абсолютна похибка у %)
+def convergence_errors(max_rolls: int = 100_000, step: int = 1000, num_checkpoints: int = 50, seed=None):
     analytical = analytical_probabilities()
+    expected = np.array([analytical[s] for s in range(2, 13)])
+    checkpoints = np.unique(np.geomspace(step, max_rolls, num_checkpoints).astype(np.int64))
     
-    # Симулюємо кидки поступово
-    all_sums = []
-    roll_counts = []
-    errors = []
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(13, dtype=np.int64)
+    total = 0
     
-    for i in range(step, max_rolls + 1, step):
-        # Додаємо нові кидки
-        new_sums = [random.randint(1, 6) + random.randint(1, 6) for _ in range(step)]
-        all_sums.extend(new_sums)
-        
-        # Обчислюємо поточну похибку
-        counts = Counter(all_sums)
-        mc_probs = {s: counts.get(s, 0) / len(all_sums) for s in range(2, 13)}
+    for checkpoint in checkpoints.tolist():
+        counts += roll_counts(checkpoint - total, rng)
+        total = checkpoint
         
         # Середня абсолютна похибка
-        avg_error = sum(abs(analytical[s] - mc_probs[s]) for s in range(2, 13)) / 11
-        
-        roll_counts.append(i)
-        errors.append(avg_error * 100)
+        avg_error = np.abs(counts[2:] / total - expected).mean()
+        yield total, float(avg_error * 100)
+
+
+def convergence_frame(max_rolls: int = 100_000, step: int = 1000, num_checkpoints: int = 50, seed=None):
+    import pandas as pd
+    
+    return pd.DataFrame(
+        convergence_errors(max_rolls, step, num_checkpoints, seed),
+        columns=['Кількість кидків', 'Середня абсолютна похибка (%)']
+    )
+
+
+# Ряд збіжності з кешу на диску, як у cached_counts. Ряд не залежить від
+# --rolls і --engine (симуляція завжди на numpy), тож ключ - параметри
+# convergence_errors і seed. Без seed результат не кешується
+def cached_convergence(max_rolls: int = 100_000, step: int = 1000, num_checkpoints: int = 50, seed=None,
+                       cache_dir: str = CACHE_DIR):
+    if seed is None:
+        return list(convergence_errors(max_rolls, step, num_checkpoints, seed))
+    
+    path = os.path.join(cache_dir, f"convergence_numpy_{max_rolls}_{step}_{num_checkpoints}_{seed}.npz")
+    if os.path.exists(path):
+        with np.load(path) as data:
+            return list(zip(data['checkpoints'].tolist(), data['errors'].tolist()))
+    
+    series = list(convergence_errors(max_rolls, step, num_checkpoints, seed))
+    checkpoints, errors = zip(*series)
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez(path, checkpoints=np.array(checkpoints), errors=np.array(errors))
+    return series
+
+
+def plot_convergence(max_rolls: int = 100_000, step: int = 1000, num_checkpoints: int = 50, seed=None):
+    import matplotlib.pyplot as plt
+    
+    checkpoints, errors = zip(*cached_convergence(max_rolls, step, num_checkpoints, seed))
     
     # Побудова графіку
     plt.style.use('seaborn-v0_8-whitegrid')
     fig, ax = plt.subplots(figsize=(12, 6))
     
-    ax.plot(roll_counts, errors, color='#e74c3c', linewidth=2)
-    ax.fill_between(roll_counts, errors, alpha=0.3, color='#e74c3c')
+    ax.plot(checkpoints, errors, color='#e74c3c', linewidth=2)
+    ax.fill_between(checkpoints, errors, alpha=0.3, color='#e74c3c')
     
     ax.set_xlabel('Кількість кидків', fontsize=12, fontweight='bold')
     ax.set_ylabel('Середня абсолютна похибка (%)', fontsize=12, fontweight='bold')
@@ -147,17 +471,46 @@ def wrapped_string(string):
     print(string)
     print("-" * 70)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Симуляція кидання двох кубиків методом Монте-Карло")
+    parser.add_argument('--rolls', type=int, default=1_000_000, help="кількість кидків")
+    parser.add_argument('--seed', type=int, default=42, help="зерно генератора (ключ кешу)")
+    parser.add_argument('--engine', choices=['python', 'numpy'], default='numpy')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--simulate-only', action='store_true',
+                      help="лише заповнити кеш, без таблиць і графіків")
+    mode.add_argument('--adaptive', action='store_true',
+                      help="кидати партіями, доки всі інтервали не стануть вужчими за --tolerance "
+                           "(замість фіксованої кількості --rolls)")
+    parser.add_argument('--tolerance', type=float, default=0.001, help="напівширина інтервалу для --adaptive")
+    parser.add_argument('--confidence', type=float, default=0.95, help="рівень довіри інтервалів")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    NUM_ROLLS = args.rolls
+    
     wrapped_string("Симуляція кидання двох шестигранних кубиків методом Монте-Карло")
+    if args.adaptive:
+        monte_carlo, NUM_ROLLS = adaptive_monte_carlo(args.tolerance, args.confidence, seed=args.seed)
+        print(f"Адаптивний режим: похибка до {args.tolerance} з довірою {args.confidence:.0%}, "
+              f"потрібно кидків: {NUM_ROLLS:,}")
+    else:
+        counts = cached_counts(NUM_ROLLS, args.seed, args.engine)
+        if args.simulate_only:
+            cached_convergence(seed=args.seed)
+            print(f"Лічильники для {NUM_ROLLS:,} кидків і ряд збіжності збережено в кеші '{CACHE_DIR}'")
+            return
+        monte_carlo = counts_to_probabilities(counts, NUM_ROLLS)
     
-    NUM_ROLLS = 1_000_000
     analytical = analytical_probabilities()
-    monte_carlo = monte_carlo_simulation(NUM_ROLLS)
     
     wrapped_string("Результати порівняння аналітичного методу та методу Монте-Карло")
     
-    df = create_comparison_table(analytical, monte_carlo)
-    print(df.to_string(index=False))
+    intervals = confidence_intervals(monte_carlo, NUM_ROLLS, args.confidence)
+    df = create_comparison_table(analytical, monte_carlo, intervals)
+    print(format_comparison_table(df))
     
     # Зберігаємо таблицю у CSV
     df.to_csv('results_comparison.csv', index=False, encoding='utf-8-sig')
@@ -170,9 +523,11 @@ def main():
     wrapped_string("Загальна статистика похибок")
     print(f"Середня абсолютна похибка: {avg_abs_error:.6f} ({avg_abs_error*100:.4f}%)")
     print(f"Максимальна абсолютна похибка: {max_error:.6f} ({max_error*100:.4f}%)")
+    statistic, p_value = chi_square_test(analytical, monte_carlo, NUM_ROLLS)
+    print(f"Критерій хі-квадрат: статистика = {statistic:.4f}, p-value = {p_value:.4f}")
     
     plot_comparison(analytical, monte_carlo, NUM_ROLLS)
-    plot_convergence()
+    plot_convergence(seed=args.seed)
 
 
 if __name__ == "__main__":
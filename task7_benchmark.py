@@ -0,0 +1,81 @@
+import os
+import time
+
+from task7 import (
+    ESTIMATORS,
+    analytical_probabilities,
+    create_comparison_table,
+    format_comparison_table,
+    estimate_probabilities,
+    monte_carlo_simulation,
+    simulate_dice_counts,
+)
+
+RUNS = [
+    ("python", 1_000_000),
+    ("numpy", 1_000_000),
+    ("numpy", 100_000_000),
+    ("numpy", 1_000_000_000),
+]
+SCALING_ROLLS = 100_000_000
+ESTIMATOR_ROLLS = [10_000, 100_000, 1_000_000]
+
+
+def benchmark_engines(runs=RUNS):
+    print(f"{'Рушій':<10}{'Кидків':>16}{'Час, с':>10}{'Кидків/с':>16}")
+    print("-" * 52)
+    for engine, num_rolls in runs:
+        start = time.perf_counter()
+        monte_carlo_simulation(num_rolls, seed=42, engine=engine)
+        elapsed = time.perf_counter() - start
+        print(f"{engine:<10}{num_rolls:>16,}{elapsed:>10.2f}{num_rolls / elapsed:>16,.0f}")
+
+
+def benchmark_workers(num_rolls=SCALING_ROLLS, num_dice=2, faces=6):
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= os.cpu_count():
+        worker_counts.append(worker_counts[-1] * 2)
+
+    print(f"{num_dice} кубики по {faces} граней, {num_rolls:,} кидків")
+    print(f"{'Процесів':<12}{'Час, с':>10}{'Кидків/с':>16}{'Прискорення':>14}")
+    print("-" * 52)
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        simulate_dice_counts(num_rolls, num_dice, faces, seed=42, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:<12}{elapsed:>10.2f}{num_rolls / elapsed:>16,.0f}{baseline / elapsed:>14.2f}")
+
+
+def benchmark_estimators(sizes=ESTIMATOR_ROLLS, seed=42):
+    analytical = analytical_probabilities()
+    print(f"{'Оцінювач':<12}{'Кидків':>12}{'Час, с':>10}{'Сер. похибка':>14}"
+          f"{'ESS(2)':>14}{'ESS(7)':>14}{'ESS(12)':>14}")
+    print("-" * 90)
+    largest = {}
+    for name in ESTIMATORS:
+        for num_rolls in sizes:
+            start = time.perf_counter()
+            probabilities, _, ess = estimate_probabilities(num_rolls, name, seed=seed)
+            elapsed = time.perf_counter() - start
+            avg_error = sum(abs(analytical[s] - probabilities[s]) for s in analytical) / len(analytical)
+            print(f"{name:<12}{num_rolls:>12,}{elapsed:>10.3f}{avg_error:>14.6f}"
+                  f"{ess[2]:>14,.0f}{ess[7]:>14,.0f}{ess[12]:>14,.0f}")
+            largest[name] = probabilities
+
+    for name, probabilities in largest.items():
+        print(f"\n{name}, {sizes[-1]:,} кидків:")
+        print(format_comparison_table(create_comparison_table(analytical, probabilities)))
+
+
+def main():
+    benchmark_engines()
+    print()
+    benchmark_workers()
+    print()
+    benchmark_estimators()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())